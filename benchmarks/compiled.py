@@ -0,0 +1,32 @@
+"""Compares building Customer shaped records with `build` against the function
+returned by `compile`.
+
+Usage: python -m benchmarks.compiled [--number N]
+"""
+import argparse
+import timeit
+
+from benchmarks.schemas import customer_builder
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=20_000)
+    args = parser.parse_args()
+
+    builder = customer_builder()
+    compiled = builder.compile()
+    results = {
+        "build": timeit.timeit(builder.build, number=args.number),
+        "compiled": timeit.timeit(compiled, number=args.number),
+    }
+    baseline = results["build"]
+    for name, seconds in results.items():
+        print(
+            f"{name:>10}: {args.number / seconds:>10,.0f} records/s "
+            f"({baseline / seconds:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Compares FileTextBuilder against splitting the file data for every word,
+which is what it did before building a word index once.
+
+Usage: python -m benchmarks.file_text [--number N]
+"""
+import argparse
+import random
+import timeit
+
+from randinator.builders import FileTextBuilder
+from randinator.data import get_package_filepath
+
+
+def split_per_word(data: str, word_number: int) -> str:
+    return " ".join(random.choice(data.split("\n")) for _ in range(word_number))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=10_000)
+    args = parser.parse_args()
+
+    filepath = get_package_filepath("words_1k.txt")
+    builder = FileTextBuilder(filepath=filepath, min_word_number=5, max_word_number=5)
+    data = filepath.read_text()
+
+    results = {
+        "split per word": timeit.timeit(
+            lambda: split_per_word(data, 5), number=args.number
+        ),
+        "build": timeit.timeit(builder.build, number=args.number),
+        "build_many": timeit.timeit(lambda: builder.build_many(args.number), number=1),
+    }
+    baseline = results["split per word"]
+    for name, seconds in results.items():
+        print(
+            f"{name:>15}: {args.number / seconds:>12,.0f} texts/s "
+            f"({baseline / seconds:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
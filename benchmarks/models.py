@@ -0,0 +1,39 @@
+"""Compares the PydanticModel construction and serialization paths on Customer
+records, against deep copying the data as it was done before.
+
+Usage: python -m benchmarks.models [--number N]
+"""
+import argparse
+import timeit
+from copy import deepcopy
+
+from benchmarks.schemas import customer_builder
+from randinator.structure.customer import Customer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=2_000)
+    args = parser.parse_args()
+
+    records = customer_builder().build_many(args.number)
+    models = Customer.validate_many(records)
+    number = args.number
+
+    results = {
+        "from_dict with deepcopy": lambda: [Customer(**deepcopy(r)) for r in records],
+        "from_dict": lambda: [Customer.from_dict(r) for r in records],
+        "validate_many": lambda: Customer.validate_many(records),
+        "construct_many": lambda: Customer.construct_many(records),
+        "as_dict with deepcopy": lambda: [deepcopy(m.model_dump()) for m in models],
+        "as_dict": lambda: [m.as_dict() for m in models],
+        "as_str": lambda: [m.as_str() for m in models],
+        "as_bytes": lambda: [m.as_bytes() for m in models],
+    }
+    for name, function in results.items():
+        seconds = min(timeit.repeat(function, number=1, repeat=5))
+        print(f"{name:>25}: {number / seconds:>10,.0f} records/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Builder trees matching the schemas of `randinator.structure`"""
+from randinator.builders import (
+    BooleanBuilder,
+    DictBuilder,
+    FileTextBuilder,
+    IntegerBuilder,
+    IntegerStrBuilder,
+    ListBuilder,
+    PicklistBuilder,
+    TextBuilder,
+    Uuid4StrBuilder,
+)
+from randinator.data import get_package_filepath
+
+
+def name_builder() -> FileTextBuilder:
+    return FileTextBuilder(
+        filepath=get_package_filepath("people_names.txt"),
+        min_word_number=2,
+        max_word_number=3,
+    )
+
+
+def dimension_builder() -> DictBuilder:
+    return DictBuilder(
+        builders={
+            "key": TextBuilder(min_word_number=1, max_word_number=1),
+            "value": TextBuilder(min_word_number=1, max_word_number=2),
+        }
+    )
+
+
+def meta_builder() -> DictBuilder:
+    return DictBuilder(
+        builders={
+            "type": PicklistBuilder(picklist=["customer"]),
+            "uuid": Uuid4StrBuilder(),
+            "active": BooleanBuilder(),
+            "country_code": PicklistBuilder(picklist=["GB", "PT", "ES", "FR"]),
+            "object_version": IntegerBuilder(min_value=1, max_value=100),
+            "schema_version": PicklistBuilder(picklist=["1.0", "2.0"]),
+            "source_event_id": Uuid4StrBuilder(),
+            "source_system": PicklistBuilder(
+                picklist=["1.0", "1.1", "1.2", "1.3", "1.4"]
+            ),
+        }
+    )
+
+
+def contact_builder() -> DictBuilder:
+    return DictBuilder(
+        builders={
+            "uuid": Uuid4StrBuilder(),
+            "name": name_builder(),
+            "email": TextBuilder(
+                min_word_number=1, max_word_number=1, post_word="@example.com"
+            ),
+            "fax": IntegerStrBuilder(min_value=10**8, max_value=10**9 - 1),
+            "phone": IntegerStrBuilder(min_value=10**8, max_value=10**9 - 1),
+            "phone_description": PicklistBuilder(picklist=["work", "mobile"]),
+        }
+    )
+
+
+def customer_builder() -> DictBuilder:
+    """A tree building `randinator.structure.customer.Customer` data, with ~50
+    fields"""
+    return DictBuilder(
+        builders={
+            "meta": meta_builder(),
+            "customer_uuid": Uuid4StrBuilder(),
+            "name": name_builder(),
+            "finance_ref": IntegerStrBuilder(min_value=10**5, max_value=10**6 - 1),
+            "on_hold": BooleanBuilder(),
+            "messages": ListBuilder(
+                min_length=0,
+                max_length=3,
+                builder=TextBuilder(min_word_number=3, max_word_number=10),
+            ),
+            "payment_details": DictBuilder(
+                builders={
+                    "payment_method": PicklistBuilder(picklist=["card", "transfer"]),
+                    "payment_term": PicklistBuilder(picklist=["30D", "60D"]),
+                }
+            ),
+            "primary_contact_id": Uuid4StrBuilder(),
+            "contacts": ListBuilder(
+                min_length=1, max_length=3, builder=contact_builder()
+            ),
+            "address_details": DictBuilder(
+                builders={
+                    "city": TextBuilder(min_word_number=1, max_word_number=2),
+                    "country_region_id": PicklistBuilder(picklist=["GB", "PT"]),
+                    "country_region_iso_code": PicklistBuilder(picklist=["GB", "PT"]),
+                    "country_name": PicklistBuilder(picklist=["UK", "Portugal"]),
+                    "description": PicklistBuilder(picklist=["Billing Address"]),
+                    "state": TextBuilder(min_word_number=1, max_word_number=1),
+                    "street": TextBuilder(min_word_number=2, max_word_number=4),
+                    "street_number": IntegerStrBuilder(min_value=1, max_value=999),
+                    "zip_code": IntegerStrBuilder(min_value=1000, max_value=9999),
+                }
+            ),
+            "d365_details": DictBuilder(
+                builders={
+                    "customer_group_id": PicklistBuilder(picklist=["A", "B", "C"]),
+                    "customer_account": IntegerStrBuilder(
+                        min_value=10**5, max_value=10**6 - 1
+                    ),
+                    "data_area_id": PicklistBuilder(picklist=["gb01", "pt01"]),
+                    "organization_name": name_builder(),
+                    "organization_number": IntegerStrBuilder(
+                        min_value=10**7, max_value=10**8 - 1
+                    ),
+                    "language_id": PicklistBuilder(picklist=["en-gb", "pt-pt"]),
+                    "clauk_account_manager": name_builder(),
+                    "clauk_sector_dim": dimension_builder(),
+                    "clauk_vertical_dim": dimension_builder(),
+                    "clauk_segment_dim": dimension_builder(),
+                    "sales_tax_group": PicklistBuilder(picklist=["UK", "EU"]),
+                    "sales_currency_code": PicklistBuilder(picklist=["GBP", "EUR"]),
+                }
+            ),
+        }
+    )
@@ -0,0 +1,241 @@
+"""Measures every registered builder, and trees shaped like the Customer schema,
+building values one at a time (`single`) and in batches (`batch`). Reports the
+values built per second, the peak of the bytes allocated while building, per
+value (tracemalloc), and the peak RSS of the process after each case.
+
+Results can be saved as a JSON baseline, and compared with one: the run fails
+when a case is slower than its baseline by more than `--threshold`. Baselines
+depend on the machine, record them on the one comparing against them.
+
+Usage:
+    python -m benchmarks.suite --save benchmarks/baseline.json
+    python -m benchmarks.suite --compare benchmarks/baseline.json --threshold 0.2
+    python -m benchmarks.suite -k integer
+"""
+import argparse
+import json
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable
+
+from benchmarks.schemas import customer_builder
+from randinator.builders import (
+    BooleanBuilder,
+    Builder,
+    DateStrBuilder,
+    DecimalBuilder,
+    DictBuilder,
+    FileTextBuilder,
+    FloatBuilder,
+    FloatStrBuilder,
+    IntegerBuilder,
+    IntegerStrBuilder,
+    ListBuilder,
+    ModelBuilder,
+    NullableBuilder,
+    PercentageBuilder,
+    PicklistBuilder,
+    ReferenceBuilder,
+    TextBuilder,
+    UniqueBuilder,
+    Uuid4StrBuilder,
+    builder_for,
+    get_builders,
+)
+from randinator.data import KeyIndex, get_package_filepath
+from randinator.structure.customer import Customer
+
+MODES = ("single", "batch")
+# Values built per batch in `batch` mode
+BATCH_SIZE = 1_000
+
+
+def _words() -> FileTextBuilder:
+    return FileTextBuilder(
+        filepath=get_package_filepath("words.txt"), min_word_number=1, max_word_number=3
+    )
+
+
+def _ints() -> IntegerBuilder:
+    return IntegerBuilder(min_value=0, max_value=1000)
+
+
+# A representative builder of every builtin builder, by registry name
+BUILDERS: dict[str, Callable[[], Builder]] = {
+    "list": lambda: ListBuilder(min_length=0, max_length=5, builder=_ints()),
+    "dict": lambda: DictBuilder(builders={"a": _ints(), "b": BooleanBuilder()}),
+    "picklist": lambda: PicklistBuilder(picklist=["GB", "PT", "ES", "FR"]),
+    "nullable": lambda: NullableBuilder(builder=_ints()),
+    "integer": _ints,
+    "integer_str": lambda: IntegerStrBuilder(min_value=0, max_value=10**9),
+    "float": lambda: FloatBuilder(min_value=0.0, max_value=1000.0),
+    "float_str": lambda: FloatStrBuilder(min_value=0.0, max_value=1000.0),
+    "percentage": lambda: PercentageBuilder(),
+    "decimal": lambda: DecimalBuilder(min_value=0.0, max_value=1000.0),
+    "boolean": BooleanBuilder,
+    "text": lambda: TextBuilder(min_word_number=1, max_word_number=3),
+    "file_text": _words,
+    "uuid4_str": Uuid4StrBuilder,
+    "date_str": DateStrBuilder,
+    "model": lambda: ModelBuilder(model=Customer),
+    # Range large enough to never be exhausted by the suite
+    "unique": lambda: UniqueBuilder(
+        builder=IntegerStrBuilder(min_value=0, max_value=10**15)
+    ),
+    "reference": lambda: ReferenceBuilder(
+        index=KeyIndex(Uuid4StrBuilder().build_many(100_000))
+    ),
+}
+
+# Trees of several builders
+TREES: dict[str, Callable[[], Builder]] = {
+    "tree:customer": customer_builder,
+    "tree:customer_from_model": lambda: builder_for(Customer),
+    "tree:weighted_picklist_100k": lambda: PicklistBuilder(
+        picklist=range(100_000), weights=[1 + i % 7 for i in range(100_000)]
+    ),
+}
+
+
+@dataclass
+class Result:
+    values_per_second: float
+    allocated_bytes_per_value: float
+    peak_rss_kb: int
+
+
+def cases() -> dict[str, Callable[[], Builder]]:
+    """Returns the builders to measure by name. Builtin builders without an entry
+    in `BUILDERS` fail the suite, so new builders get measured."""
+    missing = [
+        name
+        for name, cls in get_builders().items()
+        if cls.__module__.startswith("randinator.") and name not in BUILDERS
+    ]
+    assert not missing, f"Add the builders {missing} to BUILDERS"
+    return {**BUILDERS, **TREES}
+
+
+def measure(builder: Builder, mode: str, min_time: float, repeat: int) -> Result:
+    """Measures building values in `mode`, for at least `min_time` seconds per
+    round, keeping the fastest of `repeat` rounds"""
+    build: Callable[[], object]
+    if mode == "single":
+        build, per_call = builder.build, 1
+    else:
+        build, per_call = (lambda: builder.build_many(BATCH_SIZE)), BATCH_SIZE
+
+    build()  # Warm up caches and buffers
+    calls = 1
+    while True:  # Find the number of calls taking `min_time`, like timeit
+        seconds = _time(build, calls)
+        if seconds >= min_time:
+            break
+        calls *= 2 if seconds * 10 < min_time else 1 + int(min_time / seconds)
+    best = min([seconds] + [_time(build, calls) for _ in range(repeat - 1)])
+
+    tracemalloc.start()
+    _time(build, max(1, calls // 10))
+    allocated = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return Result(
+        values_per_second=calls * per_call / best,
+        allocated_bytes_per_value=allocated / (max(1, calls // 10) * per_call),
+        peak_rss_kb=_peak_rss_kb(),
+    )
+
+
+def _time(build: Callable[[], object], calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        build()
+    return time.perf_counter() - start
+
+
+def _peak_rss_kb() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # Bytes on macOS
+
+
+def run(keyword: str = "", min_time: float = 0.2, repeat: int = 3) -> dict[str, Result]:
+    results = {}
+    for name, make_builder in cases().items():
+        for mode in MODES:
+            case = f"{name}/{mode}"
+            if keyword in case:
+                results[case] = measure(make_builder(), mode, min_time, repeat)
+                print(_format(case, results[case]), flush=True)
+    return results
+
+
+def compare(
+    results: dict[str, Result], baseline: dict[str, dict], threshold: float
+) -> list[str]:
+    """Returns the cases slower than their baseline by more than `threshold`,
+    e.g. 0.2 for 20%"""
+    regressions = []
+    for case, result in results.items():
+        if case not in baseline:
+            continue
+        expected = baseline[case]["values_per_second"]
+        slowdown = 1 - result.values_per_second / expected
+        if slowdown > threshold:
+            regressions.append(
+                f"{case}: {result.values_per_second:,.0f} values/s, "
+                f"{slowdown:.0%} slower than {expected:,.0f}"
+            )
+    return regressions
+
+
+def _format(case: str, result: Result) -> str:
+    return (
+        f"{case:>40}: {result.values_per_second:>12,.0f} values/s "
+        f"{result.allocated_bytes_per_value:>10,.0f} B/value "
+        f"{result.peak_rss_kb / 1024:>8,.0f} MB peak RSS"
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("-k", "--keyword", default="", help="Only run cases with it")
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", type=Path, help="Save the results as a baseline")
+    parser.add_argument("--compare", type=Path, help="Baseline to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    results = run(args.keyword, args.min_time, args.repeat)
+    if args.save:
+        args.save.write_text(
+            json.dumps(
+                {
+                    "machine": {
+                        "python": platform.python_version(),
+                        "platform": platform.platform(),
+                        "processor": platform.processor(),
+                    },
+                    "results": {case: asdict(r) for case, r in results.items()},
+                },
+                indent=2,
+            )
+        )
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,4 @@
+from randinator.main_pckg import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import asyncio
+import copy
+import random
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator
+
+from randinator import engine
+from randinator.builders import Builder
+
+__all__ = [
+    "AsyncRecordSource",
+]
+
+# Put in the queue by the producer once all the records were produced
+_DONE = object()
+
+
+class AsyncRecordSource:
+    """Feeds records of a builder to asyncio code without blocking the event loop.
+    Chunks of `chunk_size` records are generated in a background thread, or in a
+    process pool if `processes` is set, and up to `prefetch` chunks are queued
+    ahead of the consumer. Yields `n` records, or endlessly if None, at most
+    `rate` records per second if given.
+
+    Each chunk is built with its own seed derived from `seed`, like the shards of
+    `randinator.engine`, so a seeded source yields the same records in threads
+    or processes. The event loop only waits for the GIL while a chunk is built
+    (threads) or unpickled (processes), which the interpreter hands back every
+    `sys.getswitchinterval()` (5ms by default). Unique builders are unique
+    across the chunks of a source with a given `n`, not of an endless one.
+
+    >>> async with AsyncRecordSource(builder, rate=1000) as source:
+    ...     async for record in source:
+    ...         await client.post(url, json=record)
+    """
+
+    def __init__(
+        self,
+        builder: Builder,
+        n: int | None = None,
+        chunk_size: int = 256,
+        prefetch: int = 4,
+        rate: float | None = None,
+        seed: int | None = None,
+        processes: int | None = None,
+    ) -> None:
+        assert isinstance(builder, Builder), f"{builder=}"
+        assert n is None or (isinstance(n, int) and n >= 0), f"{n=}"
+        assert isinstance(chunk_size, int) and chunk_size > 0, f"{chunk_size=}"
+        assert isinstance(prefetch, int) and prefetch > 0, f"{prefetch=}"
+        assert rate is None or rate > 0, f"{rate=} must be positive"
+        self.builder = builder
+        self.n = n
+        self.chunk_size = chunk_size
+        self.prefetch = prefetch
+        self.rate = rate
+        self.seed = random.SystemRandom().getrandbits(64) if seed is None else seed
+        self.processes = processes
+        self._queue: asyncio.Queue | None = None
+        self._producer: asyncio.Task | None = None
+        self._executor: ThreadPoolExecutor | engine.ShardPool | None = None
+        # Copy of the builder the thread builds from, None with processes
+        self._thread_builder: Builder | None = None
+        self._chunk: list[Any] = []
+        self._index = 0
+        self._yielded = 0
+        self._start = 0.0
+
+    async def __aenter__(self) -> "AsyncRecordSource":
+        self.start()
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        await self.aclose()
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self
+
+    def start(self) -> None:
+        """Starts producing records. Called by the first `__anext__` if needed"""
+        if self._producer is not None:
+            return
+        if self.processes is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+            self._thread_builder = copy.deepcopy(self.builder)
+        else:
+            self._executor = engine.ShardPool(self.builder, self.processes or None)
+        self._queue = asyncio.Queue(maxsize=self.prefetch)
+        self._start = asyncio.get_running_loop().time()
+        self._producer = asyncio.create_task(self._produce())
+
+    def _submit(self, index: int, *args: Any) -> Future:
+        """Builds the `index`-th chunk in the background"""
+        if isinstance(self._executor, engine.ShardPool):
+            return self._executor.submit(index, engine.build_shard, *args)
+        assert self._executor is not None
+        return self._executor.submit(engine.build_chunk, self._thread_builder, *args)
+
+    async def _produce(self) -> None:
+        assert self._queue is not None
+        splitter = random.Random(self.seed)
+        remaining = self.n
+        # Chunks of a finite source are partitions like the shards of the engine
+        n_chunks = None if self.n is None else -(-self.n // self.chunk_size)
+        index = 0
+        # Keep a chunk per process in flight, in order, on top of the queued ones
+        in_flight: list[asyncio.Future] = []
+        max_in_flight = 1
+        if isinstance(self._executor, engine.ShardPool):
+            max_in_flight = self._executor.workers
+        try:
+            while remaining is None or remaining > 0 or in_flight:
+                while len(in_flight) < max_in_flight and (
+                    remaining is None or remaining > 0
+                ):
+                    size = self.chunk_size
+                    if remaining is not None:
+                        size = min(size, remaining)
+                        remaining -= size
+                    seed = splitter.getrandbits(128)
+                    partition = None
+                    if n_chunks is not None:
+                        partition = (index, n_chunks, self.seed)
+                    future = self._submit(index, seed, size, partition)
+                    in_flight.append(asyncio.wrap_future(future))
+                    index += 1
+                await self._queue.put(await in_flight.pop(0))
+            await self._queue.put(_DONE)
+        except Exception as e:
+            await self._queue.put(e)
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    async def __anext__(self) -> Any:
+        if self._index >= len(self._chunk):
+            self.start()
+            assert self._queue is not None
+            chunk = await self._queue.get()
+            if chunk is _DONE:
+                await self._queue.put(_DONE)  # Keep signaling the end
+                raise StopAsyncIteration
+            if isinstance(chunk, Exception):
+                await self._queue.put(chunk)  # Keep raising it
+                raise chunk
+            self._chunk, self._index = chunk, 0
+        if self.rate is not None:
+            delay = self._start + self._yielded / self.rate
+            delay -= asyncio.get_running_loop().time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        record = self._chunk[self._index]
+        self._index += 1
+        self._yielded += 1
+        return record
+
+    async def aclose(self) -> None:
+        """Stops producing records and shuts down the background workers"""
+        if self._producer is not None:
+            self._producer.cancel()
+            try:
+                await self._producer
+            except asyncio.CancelledError:
+                pass
+            self._producer = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
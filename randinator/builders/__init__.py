@@ -1,5 +1,76 @@
-# flake8: noqa
-from .base import *
-from .containers import *
-from .numbers import *
-from .text import *
+"""Builders are imported lazily: `from randinator.builders import IntegerBuilder`
+only imports the module defining it"""
+import importlib
+from typing import Any
+
+# Module of every public name of the package
+_EXPORTS = {
+    name: module
+    for module, names in {
+        "base": (
+            "Builder",
+            "get_builders",
+            "get_builder",
+            "get_builder_names",
+            "load_builders",
+        ),
+        "containers": (
+            "DictBuilder",
+            "ListBuilder",
+            "ListColumn",
+            "PicklistBuilder",
+            "NullableBuilder",
+        ),
+        "instrumentation": (
+            "BuilderStats",
+            "enable_instrumentation",
+            "disable_instrumentation",
+            "instrumented",
+            "is_instrumented",
+            "get_profile",
+            "format_profile",
+            "reset_profile",
+        ),
+        "models": ("builder_for", "ModelBuilder"),
+        "numbers": (
+            "IntegerBuilder",
+            "IntegerStrBuilder",
+            "FloatBuilder",
+            "FloatStrBuilder",
+            "PercentageBuilder",
+            "DecimalBuilder",
+            "BooleanBuilder",
+        ),
+        "profiling": ("PathStats", "TreeProfiler"),
+        "references": ("ReferenceBuilder",),
+        "rng": ("NumpyRandom", "as_random"),
+        "text": (
+            "TextBuilder",
+            "FileTextBuilder",
+            "Uuid4StrBuilder",
+            "uuid4_strs",
+            "DateStrBuilder",
+        ),
+        "unique": (
+            "UniqueBuilder",
+            "UniqueValuesExhausted",
+            "FingerprintSet",
+            "fingerprint",
+        ),
+    }.items()
+    for name in names
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{_EXPORTS[name]}"), name)
+    globals()[name] = value  # Later lookups don't go through `__getattr__`
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
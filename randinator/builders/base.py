@@ -1,17 +1,27 @@
+import importlib
+import random
+import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from logging import getLogger
-from typing import Any
+from typing import Any, Callable, ClassVar, Iterator, Self
+
+from randinator.builders.rng import as_random
 
 __all__ = [
     "Builder",
     "get_builders",
     "get_builder",
     "get_builder_names",
+    "load_builders",
 ]
 
 _log = getLogger(__name__)
 
+# Number of values drawn at once by the leaves of compiled builders
+COMPILED_BLOCK_SIZE = 256
+
 
 @dataclass
 class Builder(ABC):
@@ -19,29 +29,26 @@ class Builder(ABC):
     If a default is provided, it must be of the same type as the default_type and
     it will be used instead of generating a random value, otherwise, a random
     value will be generated.
+    Random values are drawn from `rng` (a `random.Random`, a numpy `Generator` or
+    an int seed) if provided, otherwise from the global `random` module.
     """
 
     default: Any = NotImplemented
     default_type: type = NotImplemented
+    rng: random.Random | None = field(default=None, repr=False, compare=False)
+    # dtype used by `build_many(as_array=True)`, None lets numpy infer it
+    _array_dtype: ClassVar[Any] = object
 
     def __init_subclass__(cls, *args, **kwargs):
         """Registers the builder class with the name of the class normalized.
         Note: A class will only be registered if it is imported."""
-
-        def normalize_name(name: str) -> str:
-            assert "builder" in name.lower(), f"cls with {name=} must contain 'builder'"
-            __name = ""
-            for i, letter in enumerate(name):
-                __name += f"_{letter}" if letter.isupper() and i > 0 else letter
-            return __name.lower().replace("builder", "").strip("_")
-
         # Set the normalized name for the builder, used for registering
-        name = normalize_name(cls.__name__)
-        setattr(cls, "__normalized_name", name)
+        setattr(cls, "__normalized_name", normalize_name(cls.__name__))
         register(cls)
 
     def __post_init__(self) -> None:
         self.__assert_defaults()
+        self.rng = as_random(self.rng)
 
     def __assert_defaults(self) -> None:
         msg = lambda attr: f"{attr} must be provided for {self.__class__}"  # noqa: E731
@@ -50,16 +57,137 @@ class Builder(ABC):
         if self.default is not None:
             assert isinstance(self.default, self.default_type), f"{self=}"
 
+    @property
+    def _random(self) -> random.Random:
+        """The random generator to draw values from"""
+        return random if self.rng is None else self.rng  # type: ignore
+
+    def children(self) -> tuple["Builder", ...]:
+        """Returns the builders this builder delegates to"""
+        return ()
+
+    def seed(self, seed: int | None) -> Self:
+        """Seeds this builder and all of its children. Each builder gets its own
+        stream, split deterministically from `seed` in tree order, so that
+        builders never share state. A None seed restores the global generator."""
+        if seed is None:
+            self.rng = None
+            for child in self.children():
+                child.seed(None)
+            return self
+        splitter = random.Random(seed)
+        self.rng = random.Random(splitter.getrandbits(128))
+        for child in self.children():
+            child.seed(splitter.getrandbits(128))
+        return self
+
+    def partition(self, index: int, count: int, seed: int) -> Self:
+        """Restricts the unique builders of the tree to the `index`-th of `count`
+        disjoint partitions of their values, so that shards built in parallel
+        never build the same values. `seed` is shared by all the partitions and
+        seeds what they must agree on. Called by the engine for every shard."""
+        assert 0 <= index < count, f"{index=} must be in [0, {count=})"
+        for child in self.children():
+            child.partition(index, count, seed)
+        return self
+
+    def shard_streams(self) -> int | None:
+        """Returns the number of streams the shards of the tree are split into,
+        the shards of a stream having to be built in order by the same copy of
+        the tree, or None if any copy can build any shard (see `UniqueBuilder`)"""
+        streams = [s for child in self.children() if (s := child.shard_streams())]
+        return max(streams, default=None)
+
     def __call__(self) -> Any:
         return self.build()
 
     def build(self) -> Any:
+        # Hot path, kept free of logging. See `randinator.builders.instrumentation`
         if self.default is not None:
-            _log.debug(f"Using default {self.default} for {self.__class__}")
             return self.default
-        _log.debug(f"Building {self.__class__} random item")
         return self.sanitize(self.generate())
 
+    def build_many(self, n: int, as_array: bool = False) -> list[Any] | Any:
+        """Build `n` values at once. Returns a list, or a numpy array if `as_array`
+        is set. Builders with a bulk path override `generate_many`, and
+        `generate_array` if they draw numpy arrays."""
+        assert isinstance(n, int) and n >= 0, f"{n=} must be a non negative int"
+        if self.default is not None:
+            values = [self.default] * n
+            return to_array(values, self._array_dtype) if as_array else values
+        if as_array:
+            return self.generate_array(n)
+        return self.generate_many(n)
+
+    def generate_array(self, n: int) -> Any:
+        """Generates `n` values as a numpy array, converted from `generate_many`
+        unless overridden"""
+        return to_array(self.generate_many(n), self._array_dtype)
+
+    def iter_build(
+        self, n: int | None = None, chunk_size: int = 1024, rate: float | None = None
+    ) -> Iterator[Any]:
+        """Yields `n` values, or endlessly if None, built `chunk_size` at a time
+        with `build_many`, so memory doesn't grow with `n`. If `rate` is given,
+        at most `rate` values are yielded per second."""
+        assert n is None or (isinstance(n, int) and n >= 0), f"{n=}"
+        assert isinstance(chunk_size, int) and chunk_size > 0, f"{chunk_size=}"
+        assert rate is None or rate > 0, f"{rate=} must be positive"
+        remaining, yielded, start = n, 0, time.monotonic()
+        while remaining is None or remaining > 0:
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            if remaining is not None:
+                remaining -= size
+            values = self.build_many(size)
+            if rate is None:
+                yield from values
+                continue
+            for value in values:
+                delay = start + yielded / rate - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                yielded += 1
+                yield value
+
+    def generate_many(self, n: int) -> list[Any]:
+        """Generate `n` sanitized random values. Defaults to calling `generate`
+        and `sanitize` in a loop."""
+        generate, sanitize = self.generate, self.sanitize
+        return [sanitize(generate()) for _ in range(n)]
+
+    def compile(self) -> Callable[[], Any]:
+        """Returns a function building values like `build`, with the builder tree
+        flattened into a single function: constants are hoisted, defaults are
+        checked once and no-op `sanitize` calls are dropped. The function draws
+        from the generators the builders have when compiled."""
+        namespace: dict[str, Any] = {}
+        expression = self._compile_expression(namespace)
+        exec(f"def _build():\n    return {expression}\n", namespace)
+        return namespace["_build"]
+
+    def _compile_expression(self, namespace: dict[str, Any]) -> str:
+        """Returns a Python expression building a value, adding the objects it
+        references to `namespace`. Containers override it to inline children."""
+        name = f"_{len(namespace)}"
+        if self.default is not None:
+            namespace[name] = self.default
+            return name
+        namespace[name] = self._compile_leaf()
+        return f"{name}()"
+
+    def _compile_leaf(self) -> Callable[[], Any]:
+        """Returns a function generating sanitized values. Builders with a bulk
+        path are drawn from in blocks, through the `__next__` of a generator."""
+        if type(self).generate_many is Builder.generate_many:
+            generate, sanitize = self.generate, self.sanitize
+            return lambda: sanitize(generate())
+
+        def values(generate_many=self.generate_many, size=COMPILED_BLOCK_SIZE):
+            while True:
+                yield from generate_many(size)
+
+        return values().__next__
+
     @abstractmethod
     def generate(self) -> Any:
         """Generate a random value."""
@@ -69,7 +197,48 @@ class Builder(ABC):
         """Sanitizes a value to match the builder's expectations."""
 
 
-__BUILDERS = dict()
+# Module of every builder shipped with randinator, by registry name, so looking
+# one up only imports the module defining it
+BUILTIN_BUILDERS = {
+    name: f"randinator.builders.{module}"
+    for module, names in {
+        "containers": ("list", "dict", "picklist", "nullable"),
+        "numbers": (
+            "integer",
+            "integer_str",
+            "float",
+            "float_str",
+            "percentage",
+            "decimal",
+            "boolean",
+        ),
+        "references": ("reference",),
+        "text": ("text", "file_text", "uuid4_str", "date_str"),
+        "models": ("model",),
+        "unique": ("unique",),
+    }.items()
+    for name in names
+}
+BUILTIN_MODULES = tuple(dict.fromkeys(BUILTIN_BUILDERS.values()))
+# Entry point group of third party builders, e.g. in a pyproject.toml:
+# [project.entry-points."randinator.builders"]
+# my_builder = "my_package.builders:MyBuilder"
+ENTRY_POINT_GROUP = "randinator.builders"
+
+__BUILDERS: dict[str, type[Builder]] = dict()
+__REGISTERED: dict[type[Builder], str] = dict()
+__loaded = False
+
+
+@lru_cache(maxsize=None)
+def normalize_name(name: str) -> str:
+    """Returns the registry name of a builder class name,
+    e.g. `IntegerStrBuilder` -> `integer_str`"""
+    assert "builder" in name.lower(), f"cls with {name=} must contain 'builder'"
+    __name = ""
+    for i, letter in enumerate(name):
+        __name += f"_{letter}" if letter.isupper() and i > 0 else letter
+    return __name.lower().replace("builder", "").strip("_")
 
 
 def register(cls: type[Builder]):
@@ -81,27 +250,73 @@ def register(cls: type[Builder]):
     assert builder_name is not NotImplemented, f"name must be provided for {cls}"
     assert isinstance(builder_name, str)
 
-    builders = get_builders()
-    if builder_name in get_builder_names():
+    if cls in __REGISTERED:
+        raise ValueError(f"Builder {cls} already registered")
+    if builder_name in __BUILDERS:
         raise ValueError(
             f"Tried to register {cls} with the same "
-            f"name={builder_name!r} for {builders[builder_name]}"
+            f"name={builder_name!r} for {__BUILDERS[builder_name]}"
         )
-    if cls in builders:
-        raise ValueError(f"Builder {cls} already registered")
 
     __BUILDERS[builder_name] = cls
+    __REGISTERED[cls] = builder_name
     return cls
 
 
-def get_builders() -> dict[str, Builder]:
-    """Returns a dict of all registered builders"""
+def load_builders() -> None:
+    """Imports the builtin builder modules and the builders of the
+    `randinator.builders` entry points, once. Plugins failing to load are
+    logged and skipped."""
+    global __loaded
+    if __loaded:
+        return
+    __loaded = True
+    from importlib.metadata import entry_points  # Slow to import, only needed here
+
+    for module in BUILTIN_MODULES:
+        importlib.import_module(module)
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        try:
+            entry_point.load()
+        except Exception:
+            _log.exception(f"Failed to load builder plugin {entry_point.value!r}")
+
+
+def to_array(values: list[Any], dtype: Any = object) -> Any:
+    """Converts a list of built values to a 1-D numpy array. numpy is optional
+    and only required when arrays are requested."""
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError("numpy is required to build arrays") from e
+    if np.dtype(dtype) != object:
+        return np.asarray(values, dtype=dtype)
+    # Assigned rather than converted, so equal length lists (or tuples) stay
+    # values instead of becoming the rows of a 2-D array
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def get_builders() -> dict[str, type[Builder]]:
+    """Returns a dict of all registered builders, builtin and plugins included"""
+    load_builders()
     return __BUILDERS
 
 
-def get_builder(name: str) -> Builder:
-    """Returns a builder by name"""
-    return get_builders()[name]
+def get_builder(name: str) -> type[Builder]:
+    """Returns a builder class by its registry name or class name, e.g.
+    `get_builder("integer_str")` or `get_builder("IntegerStrBuilder")`. Builders
+    can then be created from config with `get_builder(name)(**config)`"""
+    if name not in __BUILDERS and "builder" in name.lower():
+        name = normalize_name(name)
+    if name not in __BUILDERS and name in BUILTIN_BUILDERS:
+        importlib.import_module(BUILTIN_BUILDERS[name])
+    if name not in __BUILDERS:  # Maybe a plugin
+        load_builders()
+    if name not in __BUILDERS:
+        raise KeyError(f"No builder named {name!r}, choose from {get_builder_names()}")
+    return __BUILDERS[name]
 
 
 def get_builder_names() -> list[str]:
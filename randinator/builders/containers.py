@@ -1,18 +1,24 @@
-import random
 from dataclasses import dataclass
+from itertools import accumulate, pairwise
 from logging import getLogger
-from typing import Any, Sequence
+from typing import Any, Iterator, Sequence
 
-from randinator.builders.base import Builder
+from randinator.builders.base import Builder, to_array
+from randinator.builders.references import ReferenceBuilder
 
 __all__ = [
     "DictBuilder",
     "ListBuilder",
+    "ListColumn",
     "PicklistBuilder",
+    "NullableBuilder",
 ]
 
 _log = getLogger(__name__)
 
+# Weighted picklists smaller than this draw batches from cumulative weights
+ALIAS_MIN_SIZE = 64
+
 
 @dataclass(kw_only=True)
 class ListBuilder(Builder):
@@ -23,21 +29,112 @@ class ListBuilder(Builder):
     default_type: type = list
 
     def __post_init__(self) -> None:
+        super().__post_init__()
         assert isinstance(self.min_length, int), f"{self=}"
         assert isinstance(self.max_length, int), f"{self=}"
         assert self.min_length <= self.max_length, f"{self=}"
         assert isinstance(self.builder, Builder), f"{self=}"
 
+    def children(self) -> tuple[Builder, ...]:
+        return (self.builder,)
+
+    def _compile_expression(self, namespace: dict[str, Any]) -> str:
+        if self.default is not None:
+            return super()._compile_expression(namespace)
+        lengths, choice = f"_{len(namespace)}", f"_{len(namespace) + 1}"
+        namespace[lengths] = range(self.min_length, self.max_length + 1)
+        namespace[choice] = self._random.choice
+        value = self.builder._compile_expression(namespace)
+        return f"[{value} for _ in range({choice}({lengths}))]"
+
     def generate(self) -> list:
-        list_length = random.randint(self.min_length, self.max_length)
-        return [self.builder.build() for _ in range(list_length)]
+        list_length = self._random.randint(self.min_length, self.max_length)
+        return self.builder.build_many(list_length)
+
+    def generate_many(self, n: int) -> list[list]:
+        # Not through `build_offsets`, which profilers count as a build
+        offsets, values = self._build_offsets(n)
+        return [values[start:end] for start, end in pairwise(offsets)]
+
+    def build_offsets(self, n: int, as_array: bool = False) -> tuple[Any, Any]:
+        """Build `n` lists as `n + 1` offsets and the flat values of all the lists,
+        like arrow list arrays: list `i` is `values[offsets[i]:offsets[i + 1]]`.
+        The lengths are drawn at once and the values built in one `build_many`
+        of the child. Returns lists, or numpy arrays if `as_array` is set, which
+        are converted from the lists, so they are still built. Like `build_many`,
+        it's an entry point counted by the profilers."""
+        return self._build_offsets(n, as_array=as_array)
+
+    def _build_offsets(self, n: int, as_array: bool = False) -> tuple[Any, Any]:
+        if self.default is not None:
+            lengths = [len(self.default)] * n
+            values = self.default * n
+            if as_array:
+                values = to_array(values, self.builder._array_dtype)
+        else:
+            lengths = self._random.choices(
+                range(self.min_length, self.max_length + 1), k=n
+            )
+            values = self.builder.build_many(sum(lengths), as_array=as_array)
+        offsets = list(accumulate(lengths, initial=0))
+        if as_array:
+            return to_array(offsets, "int64"), values
+        return offsets, values
+
+    @staticmethod
+    def to_arrow(offsets: Any, values: Any) -> Any:
+        """Converts offsets and values, as returned by `build_offsets`, to a
+        `pyarrow.ListArray`. pyarrow is optional and only required by this method."""
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError("pyarrow is required to build arrow arrays") from e
+        return pa.ListArray.from_arrays(offsets, values)
 
     def sanitize(self, value: Any) -> Any:
         return value
 
 
+class ListColumn(Sequence):
+    """Column of lists built by `DictBuilder.build_columns`, kept as the offsets
+    and flat values returned by `ListBuilder.build_offsets`. Lists are sliced
+    from the values when accessed, as Python lists."""
+
+    def __init__(self, offsets: Any, values: Any) -> None:
+        self.offsets = offsets
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"{index=} out of range")
+        return self.__slice(self.offsets[index], self.offsets[index + 1])
+
+    def __iter__(self) -> Iterator[list]:
+        offsets, values = self.offsets, self.values
+        if not isinstance(values, list):
+            values = values.tolist()  # Converted at once rather than per list
+        return map(values.__getitem__, map(slice, offsets[:-1], offsets[1:]))
+
+    def __slice(self, start: int, end: int) -> list:
+        values = self.values[start:end]
+        return values if isinstance(values, list) else values.tolist()
+
+    def to_arrow(self) -> Any:
+        return ListBuilder.to_arrow(self.offsets, self.values)
+
+
 @dataclass(kw_only=True)
 class DictBuilder(Builder):
+    """Builds a dict with a value of each builder. `ReferenceBuilder`s with a
+    path are resolved after the other fields, from the record being built."""
+
     builders: dict[str, Builder]
     default: dict | None = None
     default_type: type = dict
@@ -46,9 +143,94 @@ class DictBuilder(Builder):
         super().__post_init__()
         assert isinstance(self.builders, dict), f"{self=}"
         assert all(isinstance(v, Builder) for v in self.builders.values()), f"{self=}"
+        for k, reference in self.__references().items():
+            assert reference.key in self.builders, f"{k!r} references a missing key"
+
+    def __references(self) -> dict[str, ReferenceBuilder]:
+        return {
+            k: v
+            for k, v in self.builders.items()
+            if isinstance(v, ReferenceBuilder) and v.path is not None
+        }
+
+    def children(self) -> tuple[Builder, ...]:
+        return tuple(self.builders.values())
+
+    def _compile_expression(self, namespace: dict[str, Any]) -> str:
+        if self.default is not None or self.__references():
+            return super()._compile_expression(namespace)
+        items = (
+            f"{k!r}: {v._compile_expression(namespace)}"
+            for k, v in self.builders.items()
+        )
+        return f"{{{', '.join(items)}}}"
 
     def generate(self) -> dict:
-        return {k: v.build() for k, v in self.builders.items()}
+        references = self.__references()
+        if not references:
+            return {k: v.build() for k, v in self.builders.items()}
+        record = {
+            k: None if k in references else v.build() for k, v in self.builders.items()
+        }
+        for k, reference in references.items():
+            (record[k],) = reference.resolve_many([record[reference.key]])
+        return record
+
+    def generate_many(self, n: int) -> list[dict]:
+        if not self.builders:
+            return [{} for _ in range(n)]
+        # Not through `build_columns`, which profilers count as a build
+        return self.to_rows(self._build_columns(n))
+
+    def build_columns(self, n: int, as_array: bool = False) -> dict[str, Any]:
+        """Build `n` records as columns, with one list (or numpy array if `as_array`
+        is set) per key. Each child builder generates its column in one go. The
+        columns of `ListBuilder`s are `ListColumn`s of their offsets and flat
+        values, so the lists are only sliced when the records are read. Like
+        `build_many`, it's an entry point counted by the profilers."""
+        return self._build_columns(n, as_array=as_array)
+
+    def _build_columns(self, n: int, as_array: bool = False) -> dict[str, Any]:
+        if self.default is not None:
+            return {
+                k: to_array([v] * n) if as_array else [v] * n
+                for k, v in self.default.items()
+            }
+        references = self.__references()
+        columns: dict[str, Any] = {}
+        for k, v in self.builders.items():
+            if k in references:
+                columns[k] = None
+            elif isinstance(v, ListBuilder):
+                columns[k] = ListColumn(*v.build_offsets(n, as_array=as_array))
+            else:
+                columns[k] = v.build_many(n, as_array=as_array)
+        for k, reference in references.items():
+            column = reference.resolve_many(columns[reference.key])
+            columns[k] = to_array(column) if as_array else column
+        return columns
+
+    @staticmethod
+    def to_rows(columns: dict[str, Any]) -> list[dict]:
+        """Transposes columns, as returned by `build_columns`, to a list of records"""
+        keys = tuple(columns.keys())
+        return [dict(zip(keys, row)) for row in zip(*columns.values())]
+
+    @staticmethod
+    def to_arrow(columns: dict[str, Any]) -> Any:
+        """Converts columns, as returned by `build_columns`, to a `pyarrow.Table`,
+        `ListColumn`s being converted from their offsets and flat values.
+        pyarrow is optional and only required by this method."""
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError("pyarrow is required to build arrow tables") from e
+        return pa.table(
+            {
+                k: c.to_arrow() if isinstance(c, ListColumn) else c
+                for k, c in columns.items()
+            }
+        )
 
     def sanitize(self, value: Any) -> Any:
         return value
@@ -56,18 +238,112 @@ class DictBuilder(Builder):
 
 @dataclass(kw_only=True)
 class PicklistBuilder(Builder):
-    """Chooses a random item from a picklist"""
+    """Chooses a random item from a picklist, uniformly or with `weights`.
+    Weighted items are drawn in O(1) from an alias table built once, which
+    keeps picklists of 100k+ items (e.g. corpora) fast."""
 
     picklist: Sequence[Any]
+    weights: Sequence[float] | None = None
     default: str | None = None
     default_type: type = str
 
     def __post_init__(self) -> None:
+        super().__post_init__()
         assert isinstance(self.picklist, Sequence), f"{self=}"
         assert len(self.picklist) > 0, f"{self=}"
+        if self.weights is not None:
+            assert isinstance(self.weights, Sequence), f"{self=}"
+            assert len(self.weights) == len(self.picklist), f"{self=}"
+            assert all(w >= 0 for w in self.weights), f"{self=}"
+            assert sum(self.weights) > 0, f"{self=}"
+            self._thresholds, self._aliases = _alias_table(self.weights)
+            if len(self.picklist) < ALIAS_MIN_SIZE:
+                # Bisecting small cumulative weights is faster than the alias table
+                self._cum_weights = list(accumulate(self.weights))
 
     def generate(self) -> str:
-        return random.choice(self.picklist)
+        if self.weights is None:
+            return self._random.choice(self.picklist)
+        x = self._random.random() * len(self.picklist)
+        i = int(x)
+        return self.picklist[i if x < self._thresholds[i] else self._aliases[i]]
+
+    def generate_many(self, n: int) -> list[Any]:
+        if self.weights is None:
+            return self._random.choices(self.picklist, k=n)
+        if len(self.picklist) < ALIAS_MIN_SIZE:
+            return self._random.choices(
+                self.picklist, cum_weights=self._cum_weights, k=n
+            )
+        rand, size = self._random.random, len(self.picklist)
+        picklist, thresholds, aliases = self.picklist, self._thresholds, self._aliases
+        values = []
+        append = values.append
+        for _ in range(n):
+            x = rand() * size
+            i = int(x)
+            append(picklist[i if x < thresholds[i] else aliases[i]])
+        return values
+
+    def sanitize(self, value: Any) -> Any:
+        return value
+
+
+def _alias_table(weights: Sequence[float]) -> tuple[list[float], list[int]]:
+    """Returns the alias table of `weights`, built with Vose's method. Item `i`
+    is drawn from `x = random() * len(weights)` as `i = int(x)` if `x` is below
+    `thresholds[i]`, otherwise as `aliases[i]`. The thresholds are offset by
+    `i`, so a single random number picks both the slot and the item."""
+    size, total = len(weights), sum(weights)
+    scaled = [w * size / total for w in weights]
+    thresholds, aliases = [1.0] * size, list(range(size))
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        less, more = small.pop(), large.pop()
+        thresholds[less], aliases[less] = scaled[less], more
+        scaled[more] += scaled[less] - 1.0
+        (small if scaled[more] < 1.0 else large).append(more)
+    # Items left over are (up to rounding errors) always drawn for their slot
+    return [i + t for i, t in enumerate(thresholds)], aliases
+
+
+@dataclass(kw_only=True)
+class NullableBuilder(Builder):
+    """Builds None with a probability of `null_probability`, otherwise a value
+    of `builder`"""
+
+    builder: Builder
+    null_probability: float = 0.1
+    default: Any = None
+    default_type: type = object
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        assert isinstance(self.builder, Builder), f"{self=}"
+        assert 0.0 <= self.null_probability <= 1.0, f"{self=}"
+
+    def children(self) -> tuple[Builder, ...]:
+        return (self.builder,)
+
+    def _compile_expression(self, namespace: dict[str, Any]) -> str:
+        if self.default is not None:
+            return super()._compile_expression(namespace)
+        rand = f"_{len(namespace)}"
+        namespace[rand] = self._random.random
+        value = self.builder._compile_expression(namespace)
+        return f"(None if {rand}() < {self.null_probability!r} else {value})"
+
+    def generate(self) -> Any:
+        if self._random.random() < self.null_probability:
+            return None
+        return self.builder.build()
+
+    def generate_many(self, n: int) -> list[Any]:
+        rand, probability = self._random.random, self.null_probability
+        nulls = [rand() < probability for _ in range(n)]
+        values = iter(self.builder.build_many(nulls.count(False)))
+        return [None if null else next(values) for null in nulls]
 
     def sanitize(self, value: Any) -> Any:
         return value
@@ -0,0 +1,166 @@
+import json
+import random
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from logging import getLogger
+from time import perf_counter_ns
+from typing import Any, Callable, Iterator
+
+from randinator.builders.base import Builder
+from randinator.builders.containers import DictBuilder, ListBuilder
+
+__all__ = [
+    "BuilderStats",
+    "enable_instrumentation",
+    "disable_instrumentation",
+    "instrumented",
+    "is_instrumented",
+    "get_profile",
+    "format_profile",
+    "reset_profile",
+]
+
+_log = getLogger(__name__)
+
+
+@dataclass(slots=True)
+class BuilderStats:
+    """Counters of a builder class"""
+
+    calls: int = 0
+    values: int = 0
+    defaults: int = 0
+    nanoseconds: int = 0
+
+
+# Original `Builder` methods, swapped for the instrumented ones while enabled
+_ORIGINALS: dict[str, Callable] = {}
+_STATS: dict[type, BuilderStats] = {}
+_log_rate = 0.0
+# Own generator for sampling, so the global `random` stream isn't disturbed
+_sampler = random.Random()
+
+
+def _stats(builder: Builder) -> BuilderStats:
+    cls = type(builder)
+    stats = _STATS.get(cls)
+    if stats is None:
+        stats = _STATS[cls] = BuilderStats()
+    return stats
+
+
+def _build(self: Builder) -> Any:
+    stats = _stats(self)
+    stats.calls += 1
+    stats.values += 1
+    if _log_rate and _sampler.random() < _log_rate:
+        _log.debug("Building %s, default=%r", self.__class__, self.default)
+    if self.default is not None:
+        stats.defaults += 1
+        return self.default
+    start = perf_counter_ns()
+    value = self.sanitize(self.generate())
+    stats.nanoseconds += perf_counter_ns() - start
+    return value
+
+
+def _build_many(self: Builder, n: int, as_array: bool = False) -> Any:
+    return _count_many("build_many", self, n, as_array)
+
+
+def _build_columns(self: DictBuilder, n: int, as_array: bool = False) -> Any:
+    return _count_many("build_columns", self, n, as_array)
+
+
+def _build_offsets(self: ListBuilder, n: int, as_array: bool = False) -> Any:
+    return _count_many("build_offsets", self, n, as_array)
+
+
+def _count_many(method: str, self: Builder, n: int, as_array: bool) -> Any:
+    stats = _stats(self)
+    stats.calls += 1
+    stats.values += n
+    if _log_rate and _sampler.random() < _log_rate:
+        _log.debug("Building %s %s values, default=%r", n, self.__class__, self.default)
+    if self.default is not None:
+        stats.defaults += n
+    start = perf_counter_ns()
+    values = _ORIGINALS[method](self, n, as_array=as_array)
+    stats.nanoseconds += perf_counter_ns() - start
+    return values
+
+
+def enable_instrumentation(log_rate: float = 0.0) -> None:
+    """Instruments `build` and `build_many` of every builder, and the batch
+    `build_columns` of dicts and `build_offsets` of lists, counting calls, values,
+    defaults used and time spent (children included) per builder class.
+    A `log_rate` fraction of the calls are logged at debug level. The methods are
+    swapped here, so builders don't pay anything while instrumentation is off.
+    Functions returned by `Builder.compile` are not instrumented."""
+    global _log_rate
+    assert 0.0 <= log_rate <= 1.0, f"{log_rate=} must be between 0 and 1"
+    _log_rate = log_rate
+    if is_instrumented():
+        return
+    _ORIGINALS.update(
+        build=Builder.build,
+        build_many=Builder.build_many,
+        build_columns=DictBuilder.build_columns,
+        build_offsets=ListBuilder.build_offsets,
+    )
+    setattr(Builder, "build", _build)
+    setattr(Builder, "build_many", _build_many)
+    setattr(DictBuilder, "build_columns", _build_columns)
+    setattr(ListBuilder, "build_offsets", _build_offsets)
+
+
+def disable_instrumentation() -> None:
+    """Restores the original builder methods. The profile is kept"""
+    if not is_instrumented():
+        return
+    setattr(Builder, "build", _ORIGINALS.pop("build"))
+    setattr(Builder, "build_many", _ORIGINALS.pop("build_many"))
+    setattr(DictBuilder, "build_columns", _ORIGINALS.pop("build_columns"))
+    setattr(ListBuilder, "build_offsets", _ORIGINALS.pop("build_offsets"))
+
+
+def is_instrumented() -> bool:
+    return bool(_ORIGINALS)
+
+
+@contextmanager
+def instrumented(log_rate: float = 0.0) -> Iterator[None]:
+    """Enables instrumentation inside the context"""
+    enable_instrumentation(log_rate)
+    try:
+        yield
+    finally:
+        disable_instrumentation()
+
+
+def get_profile() -> dict[str, dict[str, int]]:
+    """Returns the counters of every instrumented builder class, by the class
+    qualified name, from the most to the least time spent"""
+    ordered = sorted(_STATS.items(), key=lambda item: -item[1].nanoseconds)
+    return {f"{cls.__module__}.{cls.__qualname__}": asdict(s) for cls, s in ordered}
+
+
+def format_profile(as_json: bool = False) -> str:
+    """Returns the profile as a text table, or as json if `as_json` is set"""
+    profile = get_profile()
+    if as_json:
+        return json.dumps(profile, indent=2)
+    lines = [
+        f"{'builder':<50} {'calls':>10} {'values':>12} {'defaults':>10} {'ms':>10}"
+    ]
+    for name, s in profile.items():
+        lines.append(
+            f"{name:<50} {s['calls']:>10} {s['values']:>12} "
+            f"{s['defaults']:>10} {s['nanoseconds'] / 1e6:>10.2f}"
+        )
+    return "\n".join(lines)
+
+
+def reset_profile() -> None:
+    """Clears the counters of every builder class"""
+    _STATS.clear()
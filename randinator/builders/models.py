@@ -0,0 +1,229 @@
+import copy
+import dataclasses
+import math
+import types
+import typing
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Literal
+
+import annotated_types
+
+from randinator import PydanticModel
+from randinator.builders.base import Builder
+from randinator.builders.containers import (
+    DictBuilder,
+    ListBuilder,
+    NullableBuilder,
+    PicklistBuilder,
+)
+from randinator.builders.numbers import (
+    BooleanBuilder,
+    DecimalBuilder,
+    FloatBuilder,
+    IntegerBuilder,
+)
+from randinator.builders.text import TextBuilder, Uuid4StrBuilder
+from randinator.structure.types import UUID4Str
+
+__all__ = [
+    "builder_for",
+    "ModelBuilder",
+]
+
+# Bounds of numbers without constraints
+DEFAULT_MIN_NUMBER = 0
+DEFAULT_MAX_NUMBER = 1000
+# Length of lists
+DEFAULT_MIN_LENGTH = 0
+DEFAULT_MAX_LENGTH = 3
+# Decimal places of floats and decimals without constraints
+DEFAULT_DECIMAL_PLACES = 2
+# Word numbers and word lengths of str without constraints
+DEFAULT_WORD_NUMBERS = (1, 3)
+DEFAULT_WORD_LENGTHS = (5, 10)
+# Constraints which don't restrict the values built
+IGNORED_CONSTRAINTS = frozenset({"strict", "allow_inf_nan"})
+
+
+@lru_cache(maxsize=None)
+def builder_for(model: type[PydanticModel]) -> DictBuilder:
+    """Returns a `DictBuilder` building data for `model`, derived from its fields
+    once and cached per model. Fields are mapped by type:
+    `str` -> `TextBuilder`, `UUID4Str` -> `Uuid4StrBuilder`, `int`/`float`/
+    `Decimal` -> number builders, `bool` -> `BooleanBuilder`, `Literal[...]` ->
+    `PicklistBuilder`, `Optional[...]` -> `NullableBuilder`, `list[...]` ->
+    `ListBuilder` and models -> `DictBuilder`. The `ge`/`gt`/`le`/`lt` bounds of
+    numbers, `max_digits`/`decimal_places` of decimals, and `min_length`/
+    `max_length` of str and lists are honored, other constraints (e.g. a
+    `pattern`) raise a `TypeError`, since the data built wouldn't be valid.
+    The tree is shared, copy it before seeding it."""
+    assert isinstance(model, type) and issubclass(model, PydanticModel), f"{model=}"
+    return DictBuilder(
+        builders={
+            name: _builder_for(field.annotation, field.metadata, f"{model}.{name}")
+            for name, field in model.model_fields.items()
+        }
+    )
+
+
+def _builder_for(annotation: Any, metadata: list[Any], path: str) -> Builder:
+    origin, args = typing.get_origin(annotation), typing.get_args(annotation)
+    if origin is typing.Annotated:
+        return _builder_for(args[0], [*metadata, *annotation.__metadata__], path)
+    if annotation is str and any(m in UUID4Str.__metadata__ for m in metadata):
+        return Uuid4StrBuilder()
+    if origin in (typing.Union, types.UnionType):
+        not_none = [a for a in args if a is not type(None)]
+        if len(not_none) != 1:
+            raise TypeError(f"Can't derive a builder for the union {path}")
+        return NullableBuilder(builder=_builder_for(not_none[0], metadata, path))
+    if origin is list:
+        (item,) = args or (str,)
+        lengths = _constraints(metadata, path, "min_length", "max_length")
+        low = lengths.get("min_length", DEFAULT_MIN_LENGTH)
+        high = lengths.get("max_length", max(DEFAULT_MAX_LENGTH, low))
+        return ListBuilder(
+            min_length=low,
+            max_length=high,
+            builder=_builder_for(item, [], f"{path}[]"),
+        )
+    if annotation is int:
+        bounds = _constraints(metadata, path, "ge", "gt", "le", "lt")
+        low, high = _bounds(bounds, 1)
+        return IntegerBuilder(min_value=int(low), max_value=int(high))
+    if annotation is float:
+        bounds = _constraints(metadata, path, "ge", "gt", "le", "lt")
+        low, high = _bounds(bounds, 10**-DEFAULT_DECIMAL_PLACES)
+        return FloatBuilder(min_value=float(low), max_value=float(high))
+    if annotation is Decimal:
+        return _decimal_builder(metadata, path)
+    if annotation is str:
+        return _text_builder(metadata, path)
+    _constraints(metadata, path)
+    if origin is Literal:
+        return PicklistBuilder(picklist=args)
+    if isinstance(annotation, type) and issubclass(annotation, PydanticModel):
+        # A copy per field, so fields of the same model are seeded separately
+        return copy.deepcopy(builder_for(annotation))
+    if annotation is bool:
+        return BooleanBuilder()
+    raise TypeError(f"Can't derive a builder for {path} of type {annotation!r}")
+
+
+def _constraints(metadata: list[Any], path: str, *supported: str) -> dict[str, Any]:
+    """Returns the `supported` constraints of a field by name, e.g.
+    `{"ge": 1}`. Raises a `TypeError` for the other constraints, which the
+    builder would ignore. Validators aren't constraints and are skipped."""
+    constraints = {}
+    for item in metadata:
+        if not isinstance(item, annotated_types.BaseMetadata):
+            continue
+        if dataclasses.is_dataclass(item):
+            values = {f.name: getattr(item, f.name) for f in dataclasses.fields(item)}
+        else:  # pydantic's metadata, e.g. a pattern
+            values = vars(item)
+        for name, value in values.items():
+            if name in supported:
+                constraints[name] = value
+            elif value is not None and name not in IGNORED_CONSTRAINTS:
+                raise TypeError(
+                    f"Can't derive a builder for {path} honoring {name}={value!r}"
+                )
+    return constraints
+
+
+def _bounds(constraints: dict[str, Any], step: Any = 0) -> tuple[Any, Any]:
+    """Returns the bounds of a number from its constraints, exclusive bounds
+    moved by `step`. A missing bound is set relative to the other one"""
+    low = high = None
+    if "ge" in constraints:
+        low = constraints["ge"]
+    if "gt" in constraints:
+        low = constraints["gt"] + step
+    if "le" in constraints:
+        high = constraints["le"]
+    if "lt" in constraints:
+        high = constraints["lt"] - step
+    if low is None:
+        low = DEFAULT_MIN_NUMBER if high is None else min(DEFAULT_MIN_NUMBER, high)
+    if high is None:
+        high = max(DEFAULT_MAX_NUMBER, low)
+    return low, high
+
+
+def _decimal_builder(metadata: list[Any], path: str) -> DecimalBuilder:
+    constraints = _constraints(
+        metadata, path, "ge", "gt", "le", "lt", "max_digits", "decimal_places"
+    )
+    places = constraints.get("decimal_places", DEFAULT_DECIMAL_PLACES)
+    low, high = _bounds(constraints, Decimal(1).scaleb(-places))
+    if "max_digits" in constraints:
+        # At most `max_digits - places` digits before the point
+        limit = Decimal(10) ** (constraints["max_digits"] - places)
+        limit -= Decimal(1).scaleb(-places)
+        low, high = max(low, -limit), min(high, limit)
+    return DecimalBuilder(
+        min_value=float(low), max_value=float(high), decimal_places=places
+    )
+
+
+def _text_builder(metadata: list[Any], path: str) -> TextBuilder:
+    """Returns a `TextBuilder` of texts between `min_length` and `max_length`
+    characters long, building a single word when words and spaces can't fit"""
+    lengths = _constraints(metadata, path, "min_length", "max_length")
+    min_length = lengths.get("min_length", 0)
+    max_length = lengths.get("max_length")
+    if max_length is not None and max_length < max(min_length, 1):
+        raise TypeError(f"Can't derive a builder for {path} of {max_length=}")
+    min_words, max_words = DEFAULT_WORD_NUMBERS
+    min_word, max_word = DEFAULT_WORD_LENGTHS
+    if max_length is not None:
+        # Texts of `max_words` words of `max_word` letters, and the spaces
+        max_word = min(max_word, max_length)
+        min_word = min(min_word, max_word)
+        max_words = max(1, min(max_words, (max_length + 1) // (max_word + 1)))
+    # Texts of `min_words` words of `min_word` letters, and the spaces
+    min_words = max(min_words, math.ceil((min_length + 1) / (min_word + 1)))
+    if min_words > max_words and max_length is not None:
+        min_words = max_words = 1
+        min_word, max_word = max(min_length, 1), max_length
+    max_words = max(min_words, max_words)
+    return TextBuilder(
+        min_word_number=min_words,
+        max_word_number=max_words,
+        min_length=min_word,
+        max_length=max_word,
+    )
+
+
+@dataclass(kw_only=True)
+class ModelBuilder(Builder):
+    """Builds instances of a pydantic model, from a copy of the tree derived by
+    `builder_for`. The instances are constructed without validation, unless
+    `validate` is set."""
+
+    model: type[PydanticModel]
+    validate: bool = False
+    default: PydanticModel | None = None
+    default_type: type = PydanticModel
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        self._builder = copy.deepcopy(builder_for(self.model))
+
+    def children(self) -> tuple[Builder, ...]:
+        return (self._builder,)
+
+    def generate(self) -> PydanticModel:
+        return self.generate_many(1)[0]
+
+    def generate_many(self, n: int) -> list[PydanticModel]:
+        records = self._builder.build_many(n)
+        if self.validate:
+            return self.model.validate_many(records)
+        return self.model.construct_many(records)
+
+    def sanitize(self, value: Any) -> Any:
+        return value
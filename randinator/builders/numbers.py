@@ -1,10 +1,8 @@
-import random
 from dataclasses import dataclass
-from decimal import Decimal
+from decimal import ROUND_CEILING, ROUND_FLOOR, ROUND_HALF_UP, Decimal
+from functools import lru_cache
 from logging import getLogger
-from typing import Any
-
-from typing_extensions import override
+from typing import Any, ClassVar
 
 from randinator.builders.base import Builder
 
@@ -19,6 +17,22 @@ __all__ = [
 ]
 _log = getLogger(__name__)
 
+# `random.choices` over a range draws indexes from a 53 bit float, so it is only
+# used for spans small enough for the bias to be negligible
+_MAX_CHOICES_SPAN = 2**32
+# Below this many values, drawing them one by one is faster than with numpy
+_MIN_NUMPY_SIZE = 32
+
+
+@lru_cache(maxsize=None)
+def _numpy() -> Any:
+    """Returns numpy if it's installed, None otherwise. numpy is optional"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
 
 @dataclass(kw_only=True)
 class IntegerBuilder(Builder):
@@ -26,6 +40,7 @@ class IntegerBuilder(Builder):
     max_value: int
     default: int | None = None
     default_type: type = int
+    _array_dtype: ClassVar[Any] = None
 
     def __post_init__(self):
         super().__post_init__()
@@ -34,7 +49,13 @@ class IntegerBuilder(Builder):
         assert self.min_value <= self.max_value, f"{self=}"
 
     def generate(self) -> int:
-        return random.randint(self.min_value, self.max_value)
+        return self._random.randint(self.min_value, self.max_value)
+
+    def generate_many(self, n: int) -> list[int]:
+        if self.max_value - self.min_value >= _MAX_CHOICES_SPAN:
+            randint = self._random.randint
+            return [randint(self.min_value, self.max_value) for _ in range(n)]
+        return self._random.choices(range(self.min_value, self.max_value + 1), k=n)
 
     def sanitize(self, value: Any) -> int:
         return int(value)
@@ -44,6 +65,10 @@ class IntegerBuilder(Builder):
 class IntegerStrBuilder(IntegerBuilder):
     default: str | None = None
     default_type: type = str
+    _array_dtype: ClassVar[Any] = object
+
+    def generate_many(self, n: int) -> list[str]:
+        return list(map(self.sanitize, super().generate_many(n)))
 
     def sanitize(self, value: Any) -> str:
         return str(value)
@@ -56,6 +81,7 @@ class FloatBuilder(Builder):
     decimal_places: int = 2
     default: float | None = None
     default_type: type = float
+    _array_dtype: ClassVar[Any] = None
 
     def __post_init__(self):
         super().__post_init__()
@@ -66,7 +92,33 @@ class FloatBuilder(Builder):
         assert self.decimal_places >= 0, f"{self=}"
 
     def generate(self) -> float:
-        return self._round(random.uniform(self.min_value, self.max_value))
+        return self._round(self._random.uniform(self.min_value, self.max_value))
+
+    def generate_many(self, n: int) -> list[float]:
+        if n >= _MIN_NUMPY_SIZE and _numpy() is not None:
+            return self.__uniform_array(n).tolist()
+        # Same as `random.uniform`, without the per value call overhead
+        low, span, rand, _round = (
+            self.min_value,
+            self.max_value - self.min_value,
+            self._random.random,
+            self._round,
+        )
+        return [_round(low + span * rand()) for _ in range(n)]
+
+    def generate_array(self, n: int) -> Any:
+        if _numpy() is None or self._array_dtype is not None:  # Values aren't floats
+            return super().generate_array(n)
+        return self.__uniform_array(n)
+
+    def __uniform_array(self, n: int) -> Any:
+        np = _numpy()
+        # The floats `random.random` makes of the same 32 bit words, so values
+        # are the same with or without numpy
+        words = np.frombuffer(self._random.randbytes(8 * n), "<u4")
+        floats = ((words[0::2] >> 5) * 67108864.0 + (words[1::2] >> 6)) * 2.0**-53
+        span = self.max_value - self.min_value
+        return np.round(self.min_value + span * floats, self.decimal_places)
 
     def _round(self, value: float) -> float:
         return round(value, self.decimal_places)
@@ -77,6 +129,11 @@ class FloatBuilder(Builder):
 
 @dataclass(kw_only=True)
 class FloatStrBuilder(FloatBuilder):
+    _array_dtype: ClassVar[Any] = object
+
+    def generate_many(self, n: int) -> list[str]:
+        return list(map(self.sanitize, super().generate_many(n)))
+
     def sanitize(self, value: Any) -> str:
         return str(value)
 
@@ -93,28 +150,63 @@ class PercentageBuilder(FloatBuilder):
 
 @dataclass(kw_only=True)
 class DecimalBuilder(FloatBuilder):
+    """Builds decimals with `decimal_places`, uniformly distributed over the
+    decimals between `min_value` and `max_value`. Values are drawn as integers
+    scaled by 10**decimal_places, so there are no float conversions."""
+
     default: Decimal | None = None
     default_type: type = Decimal
+    _array_dtype: ClassVar[Any] = object
+
+    def __post_init__(self):
+        super().__post_init__()
+        self._quantizer = Decimal(1).scaleb(-self.decimal_places)
+        # Bounds of the scaled integers, e.g. [0.005, 10] with 2 places -> [1, 1000]
+        self._min_scaled = int(
+            Decimal(str(self.min_value))
+            .scaleb(self.decimal_places)
+            .to_integral_value(ROUND_CEILING)
+        )
+        self._max_scaled = int(
+            Decimal(str(self.max_value))
+            .scaleb(self.decimal_places)
+            .to_integral_value(ROUND_FLOOR)
+        )
+        assert self._min_scaled <= self._max_scaled, f"No decimals for {self=}"
 
     def __quantize(self, value: Decimal) -> Decimal:
-        qtz_dec = Decimal(f"0.{'0' * self.decimal_places}")
-        return value.quantize(qtz_dec, rounding="ROUND_HALF_UP")
+        return value.quantize(self._quantizer, rounding=ROUND_HALF_UP)
+
+    def generate(self) -> Decimal:
+        scaled = self._random.randint(self._min_scaled, self._max_scaled)
+        return Decimal(scaled).scaleb(-self.decimal_places)
 
-    @override
-    def _round(self, value: float) -> Decimal:
-        return self.__quantize(Decimal(value))
+    def generate_many(self, n: int) -> list[Decimal]:
+        low, high, places = self._min_scaled, self._max_scaled, -self.decimal_places
+        if high - low >= _MAX_CHOICES_SPAN:
+            randint = self._random.randint
+            scaled = [randint(low, high) for _ in range(n)]
+        else:
+            scaled = self._random.choices(range(low, high + 1), k=n)
+        return [Decimal(value).scaleb(places) for value in scaled]
 
     def sanitize(self, value: Any) -> Decimal:
-        return self.__quantize(Decimal(value))
+        if not isinstance(value, Decimal):
+            value = Decimal(value)
+        return self.__quantize(value)
 
 
 @dataclass(kw_only=True)
 class BooleanBuilder(Builder):
     default: bool | None = None
     default_type: type = bool
+    _array_dtype: ClassVar[Any] = None
 
     def generate(self) -> bool:
-        return random.choice([True, False])
+        return self._random.choice([True, False])
+
+    def generate_many(self, n: int) -> list[bool]:
+        return self._random.choices((True, False), k=n)
 
     def sanitize(self, value: Any) -> Any:
         return bool(value)
@@ -0,0 +1,86 @@
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+from randinator.builders.base import Builder
+
+__all__ = [
+    "ReferenceBuilder",
+]
+
+
+@dataclass(kw_only=True)
+class ReferenceBuilder(Builder):
+    """Builds a reference to a value built elsewhere, chosen uniformly in O(1):
+
+    - with `path`, one of the values at that path of the record built by the
+      parent `DictBuilder`, e.g. `"contacts[].uuid"` for the uuid of one of the
+      contacts. `[]` steps into every item of a list. References are resolved
+      after the other fields of the record, and are None if the path holds no
+      value.
+    - with `index`, one of its keys, e.g. a `randinator.data.KeyIndex` of the
+      ids of a parent dataset, or any other sequence such as a corpus.
+    """
+
+    path: str | None = None
+    index: Sequence[Any] | None = None
+    default: Any = None
+    default_type: type = object
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        assert (self.path is None) != (self.index is None), f"{self=}"
+        if self.path is not None:
+            assert isinstance(self.path, str), f"{self=}"
+            self._steps = _parse_path(self.path)
+        else:
+            assert isinstance(self.index, Sequence), f"{self=}"
+
+    @property
+    def key(self) -> str | None:
+        """Key of the sibling field a `path` starts from"""
+        return None if self.path is None else self._steps[0][0]
+
+    def generate(self) -> Any:
+        if self.index is None:
+            raise TypeError(f"{self.path=} is resolved by its parent DictBuilder")
+        return self._random.choice(self.index)
+
+    def generate_many(self, n: int) -> list[Any]:
+        if self.index is None:
+            raise TypeError(f"{self.path=} is resolved by its parent DictBuilder")
+        return self._random.choices(self.index, k=n)
+
+    def resolve_many(self, column: Sequence[Any]) -> list[Any]:
+        """Returns a reference per value of the sibling field `key`"""
+        assert self.path is not None, f"{self=} has no path"
+        if self.default is not None:
+            return [self.default] * len(column)
+        key, choice, steps = self.key, self._random.choice, self._steps
+        references = []
+        for value in column:
+            values = _values_at({key: value}, steps)
+            references.append(choice(values) if values else None)
+        return references
+
+    def sanitize(self, value: Any) -> Any:
+        return value
+
+
+def _parse_path(path: str) -> tuple[tuple[str, bool], ...]:
+    """Returns the keys of a path, and whether each one holds a list to step in"""
+    steps = []
+    for part in path.split("."):
+        key, is_list = (part[:-2], True) if part.endswith("[]") else (part, False)
+        assert key, f"{path=} has an empty key"
+        steps.append((key, is_list))
+    return tuple(steps)
+
+
+def _values_at(record: dict, steps: tuple[tuple[str, bool], ...]) -> list[Any]:
+    values = [record]
+    for key, is_list in steps:
+        values = [v[key] for v in values if isinstance(v, dict) and key in v]
+        if is_list:
+            values = [item for v in values if v is not None for item in v]
+        values = [v for v in values if v is not None]
+    return values
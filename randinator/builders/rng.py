@@ -0,0 +1,40 @@
+import random
+from typing import Any
+
+__all__ = [
+    "NumpyRandom",
+    "as_random",
+]
+
+
+class NumpyRandom(random.Random):
+    """A `random.Random` that draws from a numpy `Generator`. Only `random` and
+    `getrandbits` are overridden, every other method is derived from them."""
+
+    def __init__(self, generator: Any) -> None:
+        self.generator = generator
+        super().__init__()
+
+    def random(self) -> float:
+        return float(self.generator.random())
+
+    def getrandbits(self, k: int) -> int:
+        if k == 0:
+            return 0
+        value = int.from_bytes(self.generator.bytes((k + 7) // 8), "little")
+        return value >> (-k % 8)
+
+    def __reduce__(self) -> tuple:
+        return self.__class__, (self.generator,)
+
+
+def as_random(rng: Any) -> random.Random | None:
+    """Returns a `random.Random` for `rng`. Accepts None, a `random.Random`,
+    a numpy `Generator` or an int seed."""
+    if rng is None or isinstance(rng, random.Random):
+        return rng
+    if isinstance(rng, int) and not isinstance(rng, bool):
+        return random.Random(rng)
+    if hasattr(rng, "bit_generator"):
+        return NumpyRandom(rng)
+    raise TypeError(f"{rng=} is not a valid random generator")
@@ -1,19 +1,26 @@
+import os
 import random
 import string
 import uuid
+import weakref
+from array import array
+from calendar import monthrange
 from dataclasses import dataclass
 from datetime import date
 from io import TextIOWrapper
+from itertools import accumulate, pairwise
 from logging import getLogger
 from pathlib import Path
 from typing import Any
 
 from randinator.builders.base import Builder
+from randinator.data.corpus import Corpus, load_corpus
 
 __all__ = [
     "TextBuilder",
     "FileTextBuilder",
     "Uuid4StrBuilder",
+    "uuid4_strs",
     "DateStrBuilder",
 ]
 
@@ -22,19 +29,45 @@ _log = getLogger(__name__)
 
 LETTERS = string.ascii_lowercase
 
+# Maps random bytes to letters. Bytes past the largest multiple of the number of
+# letters are dropped, so that every letter is equally likely
+_LETTERS_TABLE = bytes(ord(LETTERS[b % len(LETTERS)]) for b in range(256))
+_LETTERS_REJECTED = bytes(range(256 - 256 % len(LETTERS), 256))
+
+# Range of the dates built by `DateStrBuilder` when no year is fixed
+MIN_DATE = date(1970, 1, 1)
+MAX_DATE = date(2999, 12, 31)
+
+# Number of uuids generated at once to serve `Uuid4StrBuilder.build`
+UUID4_BLOCK_SIZE = 1024
+# Translation tables setting the uuid4 version and variant bits of a random byte
+_UUID4_VERSION = bytes((b & 0x0F) | 0x40 for b in range(256))
+_UUID4_VARIANT = bytes((b & 0x3F) | 0x80 for b in range(256))
+# Position of each of the 32 hex digits of a uuid in its 8-4-4-4-12 string
+_UUID4_DIGIT_POSITIONS = [
+    d + (d >= 8) + (d >= 12) + (d >= 16) + (d >= 20) for d in range(32)
+]
+
 
 @dataclass(kw_only=True)
 class TextBuilder(Builder):
+    """Builds text of random lowercase words. If `as_bytes` is set, the text is
+    utf-8 encoded bytes instead of a str."""
+
     min_word_number: int
     max_word_number: int
     min_length: int = 5
     max_length: int = 10
     pre_word: str = ""
     post_word: str = ""
-    default: str | None = None
+    as_bytes: bool = False
+    default: str | bytes | None = None
     default_type: type = str
 
     def __post_init__(self):
+        assert isinstance(self.as_bytes, bool), f"{self=}"
+        if self.as_bytes:
+            self.default_type = bytes
         super().__post_init__()
         assert isinstance(self.min_word_number, int), f"{self=}"
         assert isinstance(self.max_word_number, int), f"{self=}"
@@ -46,17 +79,45 @@ class TextBuilder(Builder):
         assert isinstance(self.post_word, str), f"{self=}"
 
     def generate(self) -> str:
-        word_number = random.randint(self.min_word_number, self.max_word_number)
-        words = " ".join(self.__word for _ in range(word_number))
-        text = f"{self.pre_word} {words} {self.post_word}".strip()
-        return text
+        return self.__texts(1)[0]
 
-    @property
-    def __word(self) -> str:
-        word_length: int = random.randint(self.min_length, self.max_length)
-        return "".join(random.choice(LETTERS) for _ in range(word_length))
+    def generate_many(self, n: int) -> list[str] | list[bytes]:
+        texts = self.__texts(n)
+        return [text.encode() for text in texts] if self.as_bytes else texts
+
+    def __texts(self, n: int) -> list[str]:
+        """Draws the word numbers, word lengths and letters of `n` texts in one go
+        each, then slices the letters into words and the words into texts."""
+        choices, pre, post = self._random.choices, self.pre_word, self.post_word
+        word_numbers = choices(
+            range(self.min_word_number, self.max_word_number + 1), k=n
+        )
+        lengths = choices(
+            range(self.min_length, self.max_length + 1), k=sum(word_numbers)
+        )
+        letters = self.__letters(sum(lengths))
+        words = [
+            letters[start:end]
+            for start, end in pairwise(accumulate(lengths, initial=0))
+        ]
+        return [
+            f"{pre} {' '.join(words[start:end])} {post}".strip()
+            for start, end in pairwise(accumulate(word_numbers, initial=0))
+        ]
+
+    def __letters(self, k: int) -> str:
+        """Returns `k` random letters, drawn as random bytes mapped to letters"""
+        letters = b""
+        while len(letters) < k:
+            missing = k - len(letters)
+            # Draw a bit more than needed to make up for the dropped bytes
+            random_bytes = self._random.randbytes(missing + missing // 8 + 16)
+            letters += random_bytes.translate(_LETTERS_TABLE, _LETTERS_REJECTED)
+        return letters[:k].decode("ascii")
 
     def sanitize(self, value: Any) -> Any:
+        if self.as_bytes:
+            return value if isinstance(value, bytes) else str(value).encode()
         return str(value)
 
 
@@ -80,22 +141,43 @@ class FileTextBuilder(Builder):
         assert isinstance(self.filepath, (Path, str, TextIOWrapper)), f"{self=}"
 
         if isinstance(self.filepath, (str, Path)):
-            self._file_data = Path(self.filepath).read_text()
+            # Corpora are shared by all the builders using the same file
+            self._words = load_corpus(self.filepath)
         elif isinstance(self.filepath, TextIOWrapper):
-            self._file_data = self.filepath.read()
+            self._words = Corpus.from_text(self.filepath.read())
         else:
             raise TypeError(f"{self.filepath=} is not a valid type")
-        assert self._file_data, f"{self.filepath} is empty"
+        assert self._words, f"{self.filepath} is empty"
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Open files can't be pickled, but their words are already in `_words`
+        state = self.__dict__.copy()
+        if isinstance(self.filepath, TextIOWrapper):
+            state["filepath"] = str(self.filepath.name)
+        return state
 
     def generate(self) -> str:
-        word_number = random.randint(self.min_word_number, self.max_word_number)
+        word_number = self._random.randint(self.min_word_number, self.max_word_number)
         words = " ".join(self.__word for _ in range(word_number))
         text = f"{self.pre_word} {words} {self.post_word}".strip()
         return text
 
+    def generate_many(self, n: int) -> list[str]:
+        randint, pre, post = self._random.randint, self.pre_word, self.post_word
+        word_numbers = [
+            randint(self.min_word_number, self.max_word_number) for _ in range(n)
+        ]
+        words = self._random.choices(self._words, k=sum(word_numbers))
+        texts, start = [], 0
+        for word_number in word_numbers:
+            end = start + word_number
+            texts.append(f"{pre} {' '.join(words[start:end])} {post}".strip())
+            start = end
+        return texts
+
     @property
     def __word(self) -> str:
-        return random.choice(self._file_data.split("\n"))
+        return self._random.choice(self._words)
 
     def sanitize(self, value: Any) -> Any:
         return str(value)
@@ -103,6 +185,10 @@ class FileTextBuilder(Builder):
 
 @dataclass(kw_only=True)
 class Uuid4StrBuilder(Builder):
+    """Builds uuid4 strings. Values are generated in blocks of `UUID4_BLOCK_SIZE`
+    from one read of entropy (`os.urandom`, or the builder's rng if set) and
+    `build` is served from a buffer of them."""
+
     default: str | None = None
     default_type: type = str
 
@@ -112,23 +198,80 @@ class Uuid4StrBuilder(Builder):
             assert isinstance(self.default, str)
             # Coerce to valid uuid
             self.default = str(uuid.UUID(self.default, version=4))
+        self.__reset_buffer()
+
+    def __reset_buffer(self) -> None:
+        self._buffer: list[str] = []
+        # The buffer is only valid for the rng that filled it
+        self._buffer_rng: random.Random | None = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Buffered values must not be shared with other processes
+        state = self.__dict__.copy()
+        state.update(_buffer=[], _buffer_rng=None)
+        return state
 
     def generate(self) -> str:
-        return str(uuid.uuid4())
+        if not self._buffer or self._buffer_rng is not self.rng:
+            self._buffer = self.generate_many(UUID4_BLOCK_SIZE)
+            self._buffer_rng = self.rng
+            _BUFFERED[id(self)] = self
+        return self._buffer.pop()
+
+    def generate_many(self, n: int) -> list[str]:
+        if self.rng is None:
+            return uuid4_strs(os.urandom(16 * n))
+        return uuid4_strs(self.rng.randbytes(16 * n))
 
     def sanitize(self, value: Any) -> Any:
         return str(value)
 
 
+# Builders with buffered values, by id since builders aren't hashable. Forked
+# processes empty the buffers, so they don't build the values of their parent
+_BUFFERED: weakref.WeakValueDictionary[
+    int, Uuid4StrBuilder
+] = weakref.WeakValueDictionary()
+
+
+def _empty_buffers() -> None:
+    for builder in list(_BUFFERED.values()):
+        builder._buffer = []
+
+
+if hasattr(os, "register_at_fork"):  # Not on Windows, which doesn't fork
+    os.register_at_fork(after_in_child=_empty_buffers)
+
+
+def uuid4_strs(random_bytes: bytes) -> list[str]:
+    """Returns a uuid4 string for every 16 bytes of `random_bytes`. The version
+    and variant bits are set and the hex digits are laid out between the dashes
+    for all of them at once, without creating `UUID` objects."""
+    assert len(random_bytes) % 16 == 0, "random_bytes must be a multiple of 16"
+    buffer = bytearray(random_bytes)
+    buffer[6::16] = buffer[6::16].translate(_UUID4_VERSION)
+    buffer[8::16] = buffer[8::16].translate(_UUID4_VARIANT)
+    hex_digits = buffer.hex().encode()
+    text = bytearray(b"-" * (len(hex_digits) // 32 * 36))
+    for digit, position in enumerate(_UUID4_DIGIT_POSITIONS):
+        text[position::36] = hex_digits[digit::32]
+    uuids = text.decode()
+    return [uuids[i:j] for i, j in pairwise(range(0, len(uuids) + 1, 36))]
+
+
 @dataclass(kw_only=True)
 class DateStrBuilder(Builder):
     """Builds a date string in isoformat. If no default is provided,
     a random date is generated. Can be forced to generate a specific
-    date by providing year, month or day."""
+    date by providing year, month or day, and bounded by `min_date` and
+    `max_date`, which replace `MIN_DATE` and `MAX_DATE`, or narrow the fixed
+    year. Dates are uniformly distributed over the valid days."""
 
     year: int | None = None
     month: int | None = None
     day: int | None = None
+    min_date: date | str | None = None
+    max_date: date | str | None = None
     default: str | None = None
     default_type: type = str
 
@@ -141,27 +284,56 @@ class DateStrBuilder(Builder):
         m = self.month if self.month is not None else 1
         d = self.day if self.day is not None else 1
         date(y, m, d)  # If date can be created it's a valid combination
+        if isinstance(self.min_date, str):
+            self.min_date = date.fromisoformat(self.min_date)
+        if isinstance(self.max_date, str):
+            self.max_date = date.fromisoformat(self.max_date)
+        assert self.min_date is None or isinstance(self.min_date, date), f"{self=}"
+        assert self.max_date is None or isinstance(self.max_date, date), f"{self=}"
         if self.default is not None:
             assert isinstance(self.default, str)
             date.fromisoformat(self.default)  # Check if valid date
+        self._ordinals = self.__valid_ordinals()
+        assert len(self._ordinals) > 0, f"No valid dates for {self=}"
 
-    def generate(self) -> str:
-        return self.__random_date.isoformat()
+    def __valid_ordinals(self) -> range | array:
+        """Returns the ordinals of every date matching the constraints. A range
+        if they are contiguous, otherwise an array of them, which is small since
+        fixing the month or the day leaves at most ~32k dates."""
+        # Explicit bounds replace the default range, but not a fixed year
+        low, high = MIN_DATE, MAX_DATE
+        if self.year is not None:
+            low, high = date(self.year, 1, 1), date(self.year, 12, 31)
+        if self.min_date is not None:
+            assert isinstance(self.min_date, date)
+            low = self.min_date if self.year is None else max(low, self.min_date)
+        if self.max_date is not None:
+            assert isinstance(self.max_date, date)
+            high = self.max_date if self.year is None else min(high, self.max_date)
+        if self.month is None and self.day is None:
+            return range(low.toordinal(), high.toordinal() + 1)
 
-    @property
-    def __random_date(self) -> date:
-        while True:
-            try:
-                return date(**self.__random_date_kwargs)
-            except ValueError:
-                "Invalid date, try again."
+        ordinals = array("l")
+        months = range(1, 13) if self.month is None else (self.month,)
+        for year in range(low.year, high.year + 1):
+            for month in months:
+                days_in_month = monthrange(year, month)[1]
+                if self.day is None:
+                    days: range | tuple[int, ...] = range(1, days_in_month + 1)
+                else:
+                    days = (self.day,) if self.day <= days_in_month else ()
+                for day in days:
+                    valid_date = date(year, month, day)
+                    if low <= valid_date <= high:
+                        ordinals.append(valid_date.toordinal())
+        return ordinals
 
-    @property
-    def __random_date_kwargs(self) -> dict[str, int]:
-        year = self.year if self.year is not None else random.randint(1970, 2999)
-        month = self.month if self.month is not None else random.randint(1, 12)
-        day = self.day if self.day is not None else random.randint(1, 31)
-        return dict(year=year, month=month, day=day)
+    def generate(self) -> str:
+        return date.fromordinal(self._random.choice(self._ordinals)).isoformat()
+
+    def generate_many(self, n: int) -> list[str]:
+        ordinals = self._random.choices(self._ordinals, k=n)
+        return list(map(date.isoformat, map(date.fromordinal, ordinals)))
 
     def sanitize(self, value: Any) -> Any:
         return str(value)
@@ -0,0 +1,283 @@
+import hashlib
+import math
+import random
+from array import array
+from dataclasses import dataclass
+from typing import Any, Callable, Self
+
+from randinator.builders.base import Builder
+from randinator.builders.numbers import IntegerBuilder
+from randinator.builders.text import Uuid4StrBuilder, uuid4_strs
+
+__all__ = [
+    "UniqueBuilder",
+    "UniqueValuesExhausted",
+    "FingerprintSet",
+    "fingerprint",
+]
+
+_MASK = 2**64 - 1
+# Odd multiplier (2**64 / golden ratio) mixing the bits of the Feistel rounds
+_MULTIPLIER = 0x9E3779B97F4A7C15
+_UUID4_RANDOM_BITS = 122
+_LOW_62 = 2**62 - 1
+
+# Partitions of the values of tracked unique builders across shards, each built
+# by a stream of shards carrying its values. More streams build more shards in
+# parallel, but each value costs about as many draws.
+UNIQUE_STREAMS = 8
+
+
+class UniqueValuesExhausted(ValueError):
+    """A unique builder can't find a value it didn't build yet"""
+
+
+def fingerprint(value: Any) -> int:
+    """Returns a non zero 64 bit fingerprint of a value, from its repr. Unlike
+    `hash`, it's the same in every process, so shards can partition values by it"""
+    digest = hashlib.blake2b(repr(value).encode(), digest_size=8).digest()
+    return int.from_bytes(digest) or 1
+
+
+class FingerprintSet:
+    """Set of 64 bit fingerprints in a flat open addressing table, taking 16 to 32
+    bytes per fingerprint (8 byte slots, kept at most half full) instead of the
+    ~100 of a set of values. 0 marks empty slots, so fingerprints must be non
+    zero."""
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._slots = array("Q", bytes(8 * 2 ** max(3, math.ceil(math.log2(capacity)))))
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __contains__(self, fp: int) -> bool:
+        slots = self._slots
+        mask = len(slots) - 1
+        i = fp & mask  # Fingerprints are uniform, their low bits are a hash
+        while slots[i]:
+            if slots[i] == fp:
+                return True
+            i = (i + 1) & mask
+        return False
+
+    def add(self, fp: int) -> bool:
+        """Adds a fingerprint, returning whether it's new"""
+        assert 0 < fp <= _MASK, f"{fp=} must be a non zero 64 bit int"
+        slots = self._slots
+        mask = len(slots) - 1
+        i = fp & mask  # Fingerprints are uniform, their low bits are a hash
+        while slots[i]:
+            if slots[i] == fp:
+                return False
+            i = (i + 1) & mask
+        slots[i] = fp
+        self._len += 1
+        if 2 * self._len > len(slots):  # Keep probes short
+            self._grow()
+        return True
+
+    def _grow(self) -> None:
+        old, self._slots = self._slots, array("Q", bytes(16 * len(self._slots)))
+        self._len = 0
+        for fp in old:
+            if fp:
+                self.add(fp)
+
+    @property
+    def nbytes(self) -> int:
+        return self._slots.itemsize * len(self._slots)
+
+
+class _Permutation:
+    """Seeded pseudo random permutation of `range(span)`, computed item by item
+    so nothing is stored: a balanced Feistel network permutes the smallest even
+    number of bits covering the span, and items out of the span are permuted
+    again (cycle walking) until they are in it, fewer than 4 times on average
+    since the bits cover less than 4 times the span."""
+
+    def __init__(self, span: int, rng: random.Random) -> None:
+        assert span > 0, f"{span=}"
+        self.span = span
+        self._half_bits = max(1, ((span - 1).bit_length() + 1) // 2)
+        # One key per round, 4 rounds being unrolled in `items`
+        self._keys = tuple(rng.getrandbits(64) for _ in range(4))
+
+    def items(self, ks: range) -> list[int]:
+        """Returns the items at the indexes `ks`"""
+        span, bits, (k0, k1, k2, k3) = self.span, self._half_bits, self._keys
+        mask, multiplier, mask64 = (1 << bits) - 1, _MULTIPLIER, _MASK
+        items = []
+        for k in ks:
+            while True:
+                left, right = k >> bits, k & mask
+                mixed = (right ^ k0) * multiplier & mask64
+                left, right = right, left ^ (mixed ^ mixed >> 32) & mask
+                mixed = (right ^ k1) * multiplier & mask64
+                left, right = right, left ^ (mixed ^ mixed >> 32) & mask
+                mixed = (right ^ k2) * multiplier & mask64
+                left, right = right, left ^ (mixed ^ mixed >> 32) & mask
+                mixed = (right ^ k3) * multiplier & mask64
+                left, right = right, left ^ (mixed ^ mixed >> 32) & mask
+                k = left << bits | right
+                if k < span:
+                    break
+            items.append(k)
+        return items
+
+
+@dataclass(kw_only=True)
+class UniqueBuilder(Builder):
+    """Builds values of `builder` that were not built before.
+
+    Integer builders (and their str variant) and uuid4 builders are collision
+    free: the k-th value is the k-th item of a random permutation of their range
+    (of the 122 random bits of uuid4s), so nothing is tracked and integer ranges
+    are used in full. Other builders are drawn again while they build seen
+    values, tracked in a `FingerprintSet`, giving up after `max_retries` draws
+    in a row without a new value.
+
+    Shards of `randinator.engine` are unique together: each shard only builds
+    the values of its partition (see `Builder.partition`). The permutation is
+    shared by the shards, which take every `count`-th item of it, so integer
+    ranges fit `count` times the size of the largest shard. Tracked values are
+    split by fingerprint into `UNIQUE_STREAMS` partitions, the shards of a
+    partition being built in order by the same copy of the tree (see
+    `Builder.shard_streams`), which carries the values they built. A value
+    costs at most about `UNIQUE_STREAMS` draws whatever the number of shards,
+    and the fingerprints of all the values are kept until the tree is reset.
+    `UniqueValuesExhausted` is raised when no new value can be found.
+    """
+
+    builder: Builder
+    max_retries: int = 100
+    default: Any = None
+    default_type: type = object
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        assert isinstance(self.builder, Builder), f"{self=}"
+        assert self.builder.default is None, f"{self=} can't have a default"
+        assert isinstance(self.max_retries, int) and self.max_retries > 0, f"{self=}"
+        # Span of the values built from a permutation, None if they are tracked
+        self._span: int | None = None
+        if isinstance(self.builder, IntegerBuilder):
+            self._span = self.builder.max_value - self.builder.min_value + 1
+        elif isinstance(self.builder, Uuid4StrBuilder):
+            self._span = 1 << _UUID4_RANDOM_BITS
+        self.reset()
+
+    def reset(self) -> None:
+        """Forgets the values built so far"""
+        self._index, self._count = 0, 1
+        # Fingerprints of the values built by each stream of shards, for the
+        # `(count, seed)` of the partitions
+        self._streams: dict[int, FingerprintSet] = {}
+        self._streams_of: tuple[int, int] | None = None
+        self.__restart()
+
+    def __restart(self) -> None:
+        self._seen = FingerprintSet()
+        self._built = 0
+        self._permutation: _Permutation | None = None
+
+    def children(self) -> tuple[Builder, ...]:
+        return (self.builder,)
+
+    def seed(self, seed: int | None) -> Self:
+        super().seed(seed)
+        self.__restart()
+        return self
+
+    def partition(self, index: int, count: int, seed: int) -> Self:
+        super().partition(index, count, seed)
+        self.__restart()
+        self._index, self._count = index, count
+        if self._span is not None:
+            self._permutation = _Permutation(self._span, random.Random(seed))
+            return self
+        if self._streams_of != (count, seed):
+            self._streams, self._streams_of = {}, (count, seed)
+        stream = index % UNIQUE_STREAMS
+        self._seen = self._streams.setdefault(stream, FingerprintSet())
+        return self
+
+    def shard_streams(self) -> int | None:
+        if self._span is None:
+            return UNIQUE_STREAMS
+        return super().shard_streams()
+
+    def generate(self) -> Any:
+        return self.generate_many(1)[0]
+
+    def generate_many(self, n: int) -> list[Any]:
+        if self._span is not None:
+            return self.__permuted_values(n)
+        return self.__tracked_values(n)
+
+    def __permuted_values(self, n: int) -> list[Any]:
+        span, index, count = self._span, self._index, self._count
+        assert span is not None
+        if self._permutation is None:
+            self._permutation = _Permutation(span, self._random)
+        permutation = self._permutation
+        # The k-th value of this partition is the (index + k * count)-th item
+        first = index + self._built * count
+        last = first + (n - 1) * count
+        if n and last >= span:
+            raise UniqueValuesExhausted(
+                f"{self.builder} has no unique values left, after building "
+                f"{self._built} of partition {index} of {count}"
+            )
+        self._built += n
+        items = permutation.items(range(first, last + 1, count))
+        if isinstance(self.builder, IntegerBuilder):
+            low, sanitize = self.builder.min_value, self.builder.sanitize
+            return [sanitize(low + item) for item in items]
+        # Laid out around the 4 version bits (76 to 79) and the 2 variant bits
+        # (62 and 63), which `uuid4_strs` sets
+        return uuid4_strs(
+            b"".join(
+                (
+                    item >> 74 << 80 | (item >> 62 & 0xFFF) << 64 | item & _LOW_62
+                ).to_bytes(16)
+                for item in items
+            )
+        )
+
+    def __tracked_values(self, n: int) -> list[Any]:
+        seen, index, count = self._seen, self._index, self._count
+        # The `count` buckets of fingerprints are dealt to the streams like the
+        # shards, so a stream gets as many buckets as shards. Draws rejected in a
+        # row before giving up are scaled by the streams, since only one value in
+        # about `streams` belongs to this one.
+        streams = min(count, UNIQUE_STREAMS)
+        stream = index % UNIQUE_STREAMS
+        max_rejected = self.max_retries * streams
+        values: list[Any] = []
+        rejected = 0
+        while len(values) < n:
+            for value in self.builder.build_many(n - len(values)):
+                fp = fingerprint(value)
+                # High bits pick the bucket, low bits the slot in `seen`
+                if (fp >> 32) % count % UNIQUE_STREAMS == stream and seen.add(fp):
+                    values.append(value)
+                    rejected = 0
+                    continue
+                rejected += 1
+                if rejected >= max_rejected:
+                    raise UniqueValuesExhausted(
+                        f"{self.builder} built no new value in {rejected} draws, "
+                        f"after building {len(seen)} of partition {index} of {count}"
+                    )
+        self._built += n
+        return values
+
+    def _compile_leaf(self) -> Callable[[], Any]:
+        # Drawn one at a time, since values drawn in a block but never built
+        # would be used up
+        return self.generate
+
+    def sanitize(self, value: Any) -> Any:
+        return value
@@ -1,8 +1,16 @@
+# flake8: noqa
+from functools import lru_cache
 from pathlib import Path
 
+from randinator.data.corpus import *
+from randinator.data.keys import *
+
+
+@lru_cache(maxsize=None)
+def _package_filenames() -> frozenset[str]:
+    return frozenset(f.name for f in Path(__file__).resolve().parent.glob("*.txt"))
+
 
 def get_package_filepath(filename: str | Path) -> Path:
-    here = Path(__file__).resolve().parent
-    filenames = list(map(lambda f: f.name, here.glob("*.txt")))
-    assert filename in filenames, f"{filename=} not available"
+    assert filename in _package_filenames(), f"{filename=} not available"
     return Path(__file__).resolve().parent / filename
@@ -0,0 +1,167 @@
+import mmap
+import os
+import sys
+from array import array
+from collections import OrderedDict
+from collections.abc import Sequence
+from logging import getLogger
+from pathlib import Path
+from typing import Any, Iterator, overload
+
+__all__ = [
+    "Corpus",
+    "MmapCorpus",
+    "load_corpus",
+    "clear_corpus_cache",
+    "MMAP_THRESHOLD",
+    "CACHE_MAX_BYTES",
+]
+
+_log = getLogger(__name__)
+
+# Files larger than this are memory mapped instead of loaded in the heap
+MMAP_THRESHOLD = 64 * 1024**2
+# Heap memory the cached corpora can hold before the least recently used is evicted
+CACHE_MAX_BYTES = 512 * 1024**2
+# Bytes stripped from the lines of memory mapped files, the ASCII whitespace
+# stripped by `str.strip`
+_WHITESPACE = b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+
+
+class Corpus(tuple):
+    """Immutable words of a text, one per non blank line, held in memory"""
+
+    filepath: Path | None
+    # Heap bytes of the tuple and its str, measured once
+    nbytes: int
+
+    def __new__(cls, words: Sequence[str] = (), filepath: Path | None = None):
+        corpus = super().__new__(cls, words)
+        corpus.filepath = filepath
+        corpus.nbytes = sys.getsizeof(corpus) + sum(map(sys.getsizeof, corpus))
+        return corpus
+
+    @classmethod
+    def from_text(cls, text: str, filepath: Path | None = None) -> "Corpus":
+        return cls(tuple(filter(None, map(str.strip, text.splitlines()))), filepath)
+
+    def __reduce__(self) -> tuple:
+        # Reload corpora from files through the cache, so a worker process reuses
+        # the corpus it inherited instead of unpickling a copy
+        if self.filepath is not None:
+            return load_corpus, (self.filepath,)
+        return self.__class__, (tuple(self),)
+
+
+class MmapCorpus(Sequence):
+    """Words of a file, one per non blank line, read from a memory mapped file.
+    Only the offsets of the lines are held in memory, the file pages are shared
+    with every process mapping the same file, including forked workers."""
+
+    def __init__(self, filepath: Path | str) -> None:
+        self.filepath = Path(filepath)
+        with open(self.filepath, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._starts, self._ends = _index_lines(self._mmap)
+
+    @property
+    def nbytes(self) -> int:
+        return self._starts.itemsize * len(self._starts) * 2
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    @overload
+    def __getitem__(self, index: int) -> str:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[str]:
+        ...
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        start, end = self._starts[index], self._ends[index]
+        return self._mmap[start:end].decode().strip()
+
+    def __iter__(self) -> Iterator[str]:
+        for start, end in zip(self._starts, self._ends):
+            yield self._mmap[start:end].decode().strip()
+
+    def __reduce__(self) -> tuple:
+        return load_corpus, (self.filepath,)
+
+
+def _index_lines(buffer: Any) -> tuple[array, array]:
+    """Returns the start and end offsets of the lines of `buffer` which aren't
+    blank, i.e. only made of ASCII whitespace. Uses numpy to find the newlines
+    and the blank lines if available, scanning in Python otherwise."""
+    starts, ends = array("Q"), array("Q")
+    try:
+        import numpy as np
+    except ImportError:
+        start, size = 0, len(buffer)
+        while start < size:
+            end = buffer.find(b"\n", start)
+            end = size if end == -1 else end
+            if buffer[start:end].strip(_WHITESPACE):
+                starts.append(start)
+                ends.append(end)
+            start = end + 1
+        return starts, ends
+
+    data = np.frombuffer(buffer, np.uint8)
+    newlines = np.flatnonzero(data == ord("\n"))
+    np_starts = np.concatenate(([0], newlines + 1)).astype(np.uint64)
+    np_ends = np.concatenate((newlines, [len(buffer)])).astype(np.uint64)
+    non_empty = np_ends > np_starts
+    np_starts, np_ends = np_starts[non_empty], np_ends[non_empty]
+    if len(np_starts):
+        # A line isn't blank if any byte from its start to the next line's start
+        # isn't whitespace, the bytes in between being newlines or blank lines
+        is_text = np.ones(256, dtype=bool)
+        is_text[list(_WHITESPACE)] = False
+        not_blank = np.logical_or.reduceat(is_text[data], np_starts.astype(np.intp))
+        np_starts, np_ends = np_starts[not_blank], np_ends[not_blank]
+    starts.frombytes(np_starts.tobytes())
+    ends.frombytes(np_ends.tobytes())
+    return starts, ends
+
+
+_CACHE: OrderedDict[tuple, Corpus | MmapCorpus] = OrderedDict()
+
+
+def load_corpus(
+    filepath: Path | str, mmap_threshold: int | None = None
+) -> Corpus | MmapCorpus:
+    """Returns the corpus of a file, from the process wide cache if the file
+    didn't change since it was loaded. Files larger than `mmap_threshold`
+    (defaults to `MMAP_THRESHOLD`) are memory mapped."""
+    filepath = Path(filepath).resolve()
+    stat = os.stat(filepath)
+    key = (filepath, stat.st_mtime_ns, stat.st_size)
+    if key in _CACHE:
+        _CACHE.move_to_end(key)
+        return _CACHE[key]
+
+    threshold = MMAP_THRESHOLD if mmap_threshold is None else mmap_threshold
+    _log.debug(f"Loading corpus {filepath}")
+    corpus: Corpus | MmapCorpus
+    if stat.st_size > threshold:
+        corpus = MmapCorpus(filepath)
+    else:
+        corpus = Corpus.from_text(filepath.read_text(), filepath)
+
+    # Drop older versions of the file and evict the least recently used corpora
+    for old_key in [k for k in _CACHE if k[0] == filepath]:
+        del _CACHE[old_key]
+    _CACHE[key] = corpus
+    while len(_CACHE) > 1 and sum(c.nbytes for c in _CACHE.values()) > CACHE_MAX_BYTES:
+        _CACHE.popitem(last=False)
+    return corpus
+
+
+def clear_corpus_cache() -> None:
+    """Removes all the corpora from the cache"""
+    _CACHE.clear()
@@ -0,0 +1,127 @@
+import mmap
+import os
+import tempfile
+import weakref
+from array import array
+from collections.abc import Sequence
+from logging import getLogger
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+__all__ = [
+    "KeyIndex",
+    "KEY_INDEX_MAX_BYTES",
+]
+
+_log = getLogger(__name__)
+
+# Bytes of keys an index holds in the heap before spilling them to a file
+KEY_INDEX_MAX_BYTES = 64 * 1024**2
+
+
+class KeyIndex(Sequence):
+    """Append only index of the keys (str or int) of a dataset, e.g. the ids of
+    generated customers, for other datasets to reference. Keys are packed in a
+    byte buffer with an array of their end offsets, so `index[i]` is O(1) and
+    costs a few bytes per key instead of a Python object. Once the buffer holds
+    more than `max_bytes`, it is spilled to a file in `directory` (the system
+    temporary directory by default), memory mapped for reading.
+
+    The spill file is removed with the index that created it. Copies share the
+    keys, and pickled indexes map the spill file instead of copying the keys.
+    """
+
+    def __init__(
+        self,
+        keys: Iterable[str | int] = (),
+        max_bytes: int = KEY_INDEX_MAX_BYTES,
+        directory: Path | str | None = None,
+    ) -> None:
+        assert isinstance(max_bytes, int) and max_bytes > 0, f"{max_bytes=}"
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.filepath: Path | None = None
+        self._key_type: type | None = None
+        self._buffer = bytearray()
+        # End offset of every key, in the spill file then in the buffer
+        self._ends = array("Q")
+        self._spilled = 0
+        self._mmap: mmap.mmap | None = None
+        self.extend(keys)
+
+    def add(self, key: str | int) -> None:
+        if self._key_type is None:
+            assert isinstance(key, (str, int)), f"{key=} must be a str or an int"
+            self._key_type = type(key)
+        assert type(key) is self._key_type, f"{key=} must be a {self._key_type}"
+        self._buffer += str(key).encode()
+        self._ends.append(self._spilled + len(self._buffer))
+        if len(self._buffer) > self.max_bytes:
+            self._spill()
+
+    def extend(self, keys: Iterable[str | int]) -> None:
+        for key in keys:
+            self.add(key)
+
+    def _spill(self) -> None:
+        if self.filepath is None:
+            fd, name = tempfile.mkstemp(suffix=".keys", dir=self.directory)
+            os.close(fd)
+            self.filepath = Path(name)
+            weakref.finalize(self, self.filepath.unlink, missing_ok=True)
+            _log.debug(f"Spilling the keys to {self.filepath}")
+        with open(self.filepath, "ab") as file:
+            file.write(self._buffer)
+        self._spilled += len(self._buffer)
+        self._buffer = bytearray()
+        self._map()
+
+    def _map(self) -> None:
+        assert self.filepath is not None
+        if self._mmap is not None:
+            self._mmap.close()
+        with open(self.filepath, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held in the heap"""
+        return len(self._buffer) + self._ends.itemsize * len(self._ends)
+
+    def __len__(self) -> int:
+        return len(self._ends)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        end = self._ends[index]
+        if index < 0:
+            index += len(self._ends)
+        start = self._ends[index - 1] if index > 0 else 0
+        if end <= self._spilled:
+            assert self._mmap is not None
+            key = self._mmap[start:end]
+        else:
+            start, end = start - self._spilled, end - self._spilled
+            key = self._buffer[start:end]
+        assert self._key_type is not None
+        return self._key_type(key.decode())
+
+    def __iter__(self) -> Iterator[Any]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __deepcopy__(self, memo: dict) -> "KeyIndex":
+        # Keys are shared, like corpora, rather than copied with builders
+        return self
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_mmap"] = None
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        # Unpickled indexes map the spill file, but don't own it
+        self.__dict__.update(state)
+        if self._spilled:
+            self._map()
@@ -0,0 +1,207 @@
+import copy
+import os
+import random
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from logging import getLogger
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from randinator.builders.base import Builder
+
+__all__ = [
+    "DEFAULT_SHARD_SIZE",
+    "shard_sizes",
+    "shard_seeds",
+    "init_worker",
+    "build_chunk",
+    "build_shard",
+    "ShardPool",
+    "iter_shards",
+    "iter_records",
+    "generate",
+    "write_shards",
+]
+
+_log = getLogger(__name__)
+
+DEFAULT_SHARD_SIZE = 10_000
+
+# Builder of the current worker process, set once by the pool initializer so it
+# isn't pickled for every shard
+_worker_builder: Builder | None = None
+
+
+def shard_sizes(n: int, shard_size: int = DEFAULT_SHARD_SIZE) -> list[int]:
+    """Returns the number of records of each shard"""
+    assert isinstance(n, int) and n >= 0, f"{n=} must be a non negative int"
+    assert isinstance(shard_size, int) and shard_size > 0, f"{shard_size=}"
+    full, rest = divmod(n, shard_size)
+    return [shard_size] * full + ([rest] if rest else [])
+
+
+def shard_seeds(seed: int, n_shards: int) -> list[int]:
+    """Returns a seed per shard, derived deterministically from `seed`"""
+    splitter = random.Random(seed)
+    return [splitter.getrandbits(128) for _ in range(n_shards)]
+
+
+def init_worker(builder: Builder | None) -> None:
+    """Sets the builder `build_shard` builds from in the current process, e.g.
+    as the initializer of a process pool running `build_shard`"""
+    global _worker_builder
+    _worker_builder = builder
+
+
+def build_chunk(
+    builder: Builder,
+    seed: int,
+    size: int,
+    partition: tuple[int, int, int] | None = None,
+) -> list[Any]:
+    """Builds `size` records from `builder`, seeded with `seed` and restricted to
+    a partition `(index, count, seed)` of the values of unique builders if given"""
+    builder.seed(seed)
+    if partition is not None:
+        builder.partition(*partition)
+    return builder.build_many(size)
+
+
+def build_shard(
+    seed: int, size: int, partition: tuple[int, int, int] | None = None
+) -> list[Any]:
+    """Same as `build_chunk`, from the builder set by `init_worker`"""
+    assert _worker_builder is not None, "worker was not initialized"
+    return build_chunk(_worker_builder, seed, size, partition)
+
+
+def _write_shard(
+    seed: int, size: int, partition: tuple[int, int, int], filepath: Path
+) -> Path:
+    from randinator.sinks import JsonLinesSink  # sinks depend on the engine
+
+    with JsonLinesSink(filepath) as sink:
+        sink.write_chunk(build_shard(seed, size, partition))
+    return filepath
+
+
+def _shard_tasks(seed: int, sizes: list[int]) -> list[tuple[int, int, tuple]]:
+    """Returns the seed, size and partition of every shard"""
+    seeds = shard_seeds(seed, len(sizes))
+    return [
+        (shard_seed, size, (i, len(sizes), seed))
+        for i, (shard_seed, size) in enumerate(zip(seeds, sizes))
+    ]
+
+
+class ShardPool:
+    """Pool of `workers` processes (all cores if None) running shard functions,
+    such as `build_shard`, on the builder set by `init_worker`. Shards are dealt
+    to the processes by index, so that the shards of a stream of
+    `Builder.shard_streams` are all built, in order, by the same process."""
+
+    def __init__(self, builder: Builder, workers: int | None = None) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self._streams = builder.shard_streams()
+        if self._streams is not None:
+            self.workers = min(self.workers, self._streams)
+        # One process per executor, since executors pick the process of a task
+        self._executors = [
+            ProcessPoolExecutor(
+                max_workers=1, initializer=init_worker, initargs=(builder,)
+            )
+            for _ in range(self.workers)
+        ]
+
+    def submit(self, index: int, function: Callable[..., Any], *args: Any) -> Future:
+        """Runs `function(*args)` for the `index`-th shard"""
+        if self._streams is not None:
+            index %= self._streams
+        return self._executors[index % self.workers].submit(function, *args)
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        for executor in self._executors:
+            executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+def _run(
+    builder: Builder, tasks: list[tuple], function: Any, workers: int | None
+) -> Iterator[Any]:
+    """Runs `function` for every task, yielding results in task order. At most
+    two tasks per worker are in flight, so memory doesn't grow with `n`."""
+    if workers == 1:
+        init_worker(copy.deepcopy(builder))
+        try:
+            for task in tasks:
+                yield function(*task)
+        finally:
+            init_worker(None)
+        return
+
+    pool = ShardPool(builder, workers)
+    pending: deque[Future] = deque()
+    max_pending = 2 * pool.workers
+    try:
+        for index, task in enumerate(tasks):
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+            pending.append(pool.submit(index, function, *task))
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        pool.shutdown()
+
+
+def iter_shards(
+    builder: Builder,
+    n: int,
+    seed: int | None = None,
+    workers: int | None = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+) -> Iterator[list[Any]]:
+    """Generates `n` records from `builder` across `workers` processes (all cores
+    if None, in process if 1), yielding a list of records per shard, in order.
+    Each shard has a fixed size and its own seed derived from `seed`, so the
+    output doesn't depend on the number of workers. Shards build disjoint values
+    with unique builders. If no `seed` is provided, a random one is used."""
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+    sizes = shard_sizes(n, shard_size)
+    tasks = _shard_tasks(seed, sizes)
+    _log.debug(f"Generating {n} records in {len(tasks)} shards with {seed=}")
+    yield from _run(builder, tasks, build_shard, workers)
+
+
+def iter_records(builder: Builder, n: int, **kwargs) -> Iterator[Any]:
+    """Same as `iter_shards`, yielding one record at a time"""
+    for shard in iter_shards(builder, n, **kwargs):
+        yield from shard
+
+
+def generate(builder: Builder, n: int, **kwargs) -> list[Any]:
+    """Same as `iter_shards`, returning all the records in a list"""
+    return list(iter_records(builder, n, **kwargs))
+
+
+def write_shards(
+    builder: Builder,
+    n: int,
+    directory: Path | str,
+    seed: int | None = None,
+    workers: int | None = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+) -> list[Path]:
+    """Generates `n` records like `iter_shards`, but each worker writes its shards
+    to `directory` as JSON lines files. Returns the shard filepaths, in order."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+    sizes = shard_sizes(n, shard_size)
+    tasks = [
+        (*task, directory / f"shard-{i:05d}.jsonl")
+        for i, task in enumerate(_shard_tasks(seed, sizes))
+    ]
+    return list(_run(builder, tasks, _write_shard, workers))
@@ -1,2 +1,58 @@
-def main():
-    ...
+import argparse
+import importlib
+from typing import Sequence
+
+from randinator.builders import Builder
+from randinator.engine import DEFAULT_SHARD_SIZE
+from randinator.schema import SCHEMA_SUFFIXES, load_schema
+from randinator.sinks import write
+
+
+def load_builder(reference: str) -> Builder:
+    """Imports a builder from a "module:attribute" reference. The attribute can
+    be a builder or a function returning one. References to json or yaml files
+    are loaded as schemas."""
+    if reference.endswith(SCHEMA_SUFFIXES):
+        return load_schema(reference)
+    module_name, _, attribute = reference.partition(":")
+    assert module_name and attribute, f"{reference=} must be 'module:attribute'"
+    builder = getattr(importlib.import_module(module_name), attribute)
+    if not isinstance(builder, Builder) and callable(builder):
+        builder = builder()
+    assert isinstance(builder, Builder), f"{reference=} is not a builder"
+    return builder
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="randinator", description="Generate random records to a file"
+    )
+    parser.add_argument(
+        "builder",
+        help="'module:attribute' of a builder, or of a function returning one, "
+        "or a json or yaml schema file",
+    )
+    parser.add_argument("-n", "--number", type=int, required=True)
+    parser.add_argument("-o", "--output", help="Output file, stdout if not given")
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=["jsonl", "csv", "parquet"],
+        help="Output format, inferred from the output suffix if not given",
+    )
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_SHARD_SIZE)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Number of processes, 0 for all cores"
+    )
+    args = parser.parse_args(argv)
+
+    write(
+        load_builder(args.builder),
+        args.number,
+        args.output,
+        format=args.format,
+        chunk_size=args.chunk_size,
+        seed=args.seed,
+        workers=args.workers or None,
+    )
@@ -0,0 +1,113 @@
+import types
+import typing
+from functools import lru_cache
+from typing import Any, Iterable, Self
+
+import pydantic
+
+__all__ = ["PydanticModel"]
+
+
+class PydanticModel(pydantic.BaseModel):
+    """Custom pydantic model for all schemas and payload messages"""
+
+    model_config = pydantic.ConfigDict(
+        arbitrary_types_allowed=True,
+        # strict=True,  # types should be enforced?
+        validate_assignment=True,
+        extra="forbid",
+    )
+
+    def as_dict(self, **kwargs) -> dict[str, Any]:
+        """Return a dict with the model's data. `model_dump` already builds new
+        containers, so the dict can be modified without affecting the model"""
+        return self.model_dump(**kwargs)
+
+    def as_json(self, **kwargs) -> dict[str, Any]:
+        """Return a dict with the model's data, ready for json serialization"""
+        kwargs.update(mode="json")
+        return self.as_dict(**kwargs)
+
+    def as_str(self, **kwargs) -> str:
+        """Return a the model's data as a string. Can be used with `json.loads()`"""
+        return self.model_dump_json(**kwargs)
+
+    def as_bytes(self, **kwargs) -> bytes:
+        """Return the model's data as json bytes, without decoding them to a str"""
+        return self.__pydantic_serializer__.to_json(self, **kwargs)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Self:
+        """Validates `data` into a model. Validation builds new containers, so
+        `data` isn't shared with the model"""
+        return cls.model_validate(data)
+
+    @classmethod
+    def validate_many(cls, records: Iterable[dict]) -> list[Self]:
+        """Validates a batch of records in a single call to the validator"""
+        return _list_adapter(cls).validate_python(
+            records if isinstance(records, list) else list(records)
+        )
+
+    @classmethod
+    def construct_many(cls, records: Iterable[dict]) -> list[Self]:
+        """Builds models from trusted records, e.g. built by a builder tree matching
+        the model, without validation. Nested models are constructed as well."""
+        return [_construct(cls, record) for record in records]
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(cls: type[PydanticModel]) -> pydantic.TypeAdapter:
+    return pydantic.TypeAdapter(list[cls])  # type: ignore
+
+
+def _model_of(annotation: Any) -> tuple[type[PydanticModel] | None, bool]:
+    """Returns the model of an annotation, unwrapping Optional, and whether it's a
+    list of that model"""
+    origin = typing.get_origin(annotation)
+    if origin in (typing.Union, types.UnionType):
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        return _model_of(args[0]) if len(args) == 1 else (None, False)
+    if origin is list:
+        (item,) = typing.get_args(annotation) or (Any,)
+        model, _ = _model_of(item)
+        return model, model is not None
+    if isinstance(annotation, type) and issubclass(annotation, PydanticModel):
+        return annotation, False
+    return None, False
+
+
+@lru_cache(maxsize=None)
+def _construct_plan(
+    cls: type[PydanticModel],
+) -> tuple[tuple[tuple[str, type, bool], ...], int]:
+    """Returns the fields of a model holding models and its number of fields,
+    computed once per class"""
+    nested = []
+    for name, field in cls.model_fields.items():
+        model, is_list = _model_of(field.annotation)
+        if model is not None:
+            nested.append((name, model, is_list))
+    return tuple(nested), len(cls.model_fields)
+
+
+def _construct(cls: type[PydanticModel], data: dict) -> Any:
+    nested, n_fields = _construct_plan(cls)
+    data = dict(data)
+    for name, model, is_list in nested:
+        value = data.get(name)
+        if is_list and isinstance(value, list):
+            data[name] = [
+                _construct(model, v) if isinstance(v, dict) else v for v in value
+            ]
+        elif isinstance(value, dict):
+            data[name] = _construct(model, value)
+    if len(data) != n_fields:
+        return cls.model_construct(**data)  # Fills in the defaults
+    # Same as `model_construct` for complete data, without its per field checks
+    model = cls.__new__(cls)
+    object.__setattr__(model, "__dict__", data)
+    object.__setattr__(model, "__pydantic_fields_set__", set(data))
+    object.__setattr__(model, "__pydantic_extra__", None)
+    object.__setattr__(model, "__pydantic_private__", None)
+    return model
@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+import pickle
+from collections import abc
+from functools import lru_cache
+from logging import getLogger
+from pathlib import Path
+from typing import Any, Mapping, get_args, get_origin, get_type_hints
+
+from randinator.builders.base import Builder, get_builder
+
+__all__ = [
+    "SchemaError",
+    "SCHEMA_SUFFIXES",
+    "parse_schema",
+    "build_schema",
+    "load_schema",
+]
+
+_log = getLogger(__name__)
+
+# Key of the registered builder name in a schema node
+TYPE_KEY = "type"
+SCHEMA_SUFFIXES = (".json", ".yaml", ".yml")
+# Bumped when cached trees of an older randinator can't be reused
+CACHE_VERSION = 1
+
+
+class SchemaError(ValueError):
+    """A schema doesn't describe a valid builder tree"""
+
+
+def parse_schema(content: bytes | str, suffix: str) -> Any:
+    """Parses the content of a json or yaml schema file. PyYAML is optional and
+    only required for yaml schemas."""
+    if suffix == ".json":
+        return json.loads(content)
+    if suffix not in SCHEMA_SUFFIXES:
+        raise SchemaError(f"{suffix=} must be one of {SCHEMA_SUFFIXES}")
+    try:
+        import yaml
+    except ImportError as e:
+        raise ImportError("PyYAML is required to load yaml schemas") from e
+    return yaml.load(content, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+def build_schema(schema: Mapping[str, Any]) -> Builder:
+    """Builds the builder tree described by a schema. A node is a mapping with
+    the registered name of a builder under "type" and its arguments, e.g.
+    `{"type": "list", "max_length": 3, "builder": {"type": "integer", ...}}`.
+    Arguments which are nodes, or mappings or lists of nodes, are built too.
+    Arguments mapping names to builders, like the `builders` of a dict, are
+    never nodes, so fields can be named "type".
+    Raises a `SchemaError` locating the first invalid node."""
+    builder = _build_value(schema, "schema")
+    if not isinstance(builder, Builder):
+        raise SchemaError(f"schema must be a node with a {TYPE_KEY!r}")
+    return builder
+
+
+def _build_value(value: Any, path: str) -> Any:
+    if isinstance(value, Mapping):
+        if TYPE_KEY in value:
+            return _build_node(value, path)
+        return {k: _build_value(v, f"{path}.{k}") for k, v in value.items()}
+    if isinstance(value, list):
+        return [_build_value(v, f"{path}[{i}]") for i, v in enumerate(value)]
+    return value
+
+
+def _build_node(node: Mapping[str, Any], path: str) -> Builder:
+    name = node[TYPE_KEY]
+    if not isinstance(name, str):
+        raise SchemaError(f"{path}.{TYPE_KEY}: {name!r} is not a builder name")
+    try:
+        cls = get_builder(name)
+    except KeyError as e:
+        raise SchemaError(f"{path}: {e.args[0]}") from None
+    builder_maps = _builder_map_fields(cls)
+    kwargs = {}
+    for k, v in node.items():
+        if k == TYPE_KEY:
+            continue
+        if k in builder_maps and isinstance(v, Mapping):
+            kwargs[k] = {f: _build_value(b, f"{path}.{k}.{f}") for f, b in v.items()}
+        else:
+            kwargs[k] = _build_value(v, f"{path}.{k}")
+    try:
+        return cls(**kwargs)
+    except (AssertionError, TypeError, ValueError) as e:
+        raise SchemaError(f"{path}: invalid {name!r} builder: {e}") from e
+
+
+@lru_cache
+def _builder_map_fields(cls: type[Builder]) -> frozenset[str]:
+    """Returns the arguments of a builder annotated as mappings of builders"""
+    try:
+        hints = get_type_hints(cls)
+    except NameError:  # Unresolvable annotations of a third party builder
+        return frozenset()
+    return frozenset(
+        k
+        for k, hint in hints.items()
+        if get_origin(hint) in (dict, abc.Mapping) and get_args(hint)[-1:] == (Builder,)
+    )
+
+
+def load_schema(
+    schema: Path | str | Mapping[str, Any],
+    cache: bool = True,
+    cache_dir: Path | str | None = None,
+) -> Builder:
+    """Returns the builder tree of a schema file, or of an already parsed schema.
+    The tree of a file is pickled in `cache_dir`, keyed by the hash of the file
+    content and of the randinator sources, so later loads skip parsing and
+    validating it. The cache defaults to `$RANDINATOR_CACHE_DIR/schemas`, or
+    `~/.cache/randinator/schemas`."""
+    if isinstance(schema, Mapping):
+        return build_schema(schema)
+    filepath = Path(schema)
+    content = filepath.read_bytes()
+    if not cache:
+        return build_schema(parse_schema(content, filepath.suffix))
+
+    cache_path = _cache_dir(cache_dir) / f"{_schema_hash(content, filepath)}.pickle"
+    try:
+        with open(cache_path, "rb") as file:
+            builder = pickle.load(file)
+        assert isinstance(builder, Builder), f"{cache_path} is not a builder"
+        return builder
+    except FileNotFoundError:
+        pass
+    except Exception:
+        _log.warning(f"Ignoring the invalid cached schema {cache_path}", exc_info=True)
+
+    builder = build_schema(parse_schema(content, filepath.suffix))
+    _write_cache(cache_path, builder)
+    return builder
+
+
+def _cache_dir(cache_dir: Path | str | None) -> Path:
+    if cache_dir is not None:
+        return Path(cache_dir)
+    root = os.environ.get("RANDINATOR_CACHE_DIR")
+    return (Path(root) if root else Path.home() / ".cache" / "randinator") / "schemas"
+
+
+@lru_cache(maxsize=1)
+def _sources_digest() -> str:
+    """Returns a digest of the randinator sources. Unlike the version, it changes
+    with the code of a source tree or an editable install."""
+    package = Path(__file__).parent
+    digest = hashlib.sha256()
+    for path in sorted(package.rglob("*.py")):
+        digest.update(path.relative_to(package).as_posix().encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _schema_hash(content: bytes, filepath: Path) -> str:
+    # Pickled trees depend on the builders of the randinator that built them
+    key = f"{CACHE_VERSION}:{_sources_digest()}:{filepath.suffix}"
+    digest = hashlib.sha256(key.encode())
+    digest.update(content)
+    return digest.hexdigest()
+
+
+def _write_cache(cache_path: Path, builder: Builder) -> None:
+    # Written to a temporary file first, so concurrent workers never read a
+    # partial file. Failing to cache only costs the next load a rebuild.
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "wb") as file:
+            pickle.dump(builder, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except (OSError, pickle.PicklingError, TypeError, AttributeError):
+        # AttributeError is raised for local objects, e.g. a lambda default
+        _log.warning(f"Failed to cache the schema in {cache_path}", exc_info=True)
+        tmp_path.unlink(missing_ok=True)
@@ -0,0 +1,190 @@
+import csv
+import io
+import json
+import sys
+from abc import ABC, abstractmethod
+from logging import getLogger
+from pathlib import Path
+from typing import IO, Any, Iterable
+
+from randinator import engine
+from randinator.builders import Builder, DictBuilder
+
+__all__ = [
+    "Sink",
+    "JsonLinesSink",
+    "CsvSink",
+    "ParquetSink",
+    "get_sink",
+    "write",
+    "FORMATS",
+]
+
+_log = getLogger(__name__)
+
+
+def _default(value: Any) -> Any:
+    """Serializes values json doesn't know about, e.g. Decimal"""
+    return str(value)
+
+
+class Sink(ABC):
+    """Writes chunks of records incrementally to a file, or an open file object.
+    Only the chunk being written is held in memory."""
+
+    binary = False
+
+    def __init__(self, file: Path | str | IO) -> None:
+        if isinstance(file, (str, Path)):
+            if self.binary:
+                self._file: IO = open(file, "wb")
+            else:
+                self._file = open(file, "w", newline="")
+            self._owns_file = True
+        else:
+            self._file = file
+            self._owns_file = False
+
+    def __enter__(self) -> "Sink":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    @abstractmethod
+    def write_chunk(self, records: list[Any]) -> None:
+        """Writes a chunk of records"""
+
+    def close(self) -> None:
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+
+class JsonLinesSink(Sink):
+    """Writes one json record per line, encoded with orjson if it is installed"""
+
+    binary = True
+
+    def __init__(self, file: Path | str | IO) -> None:
+        super().__init__(file)
+        self._text = isinstance(self._file, io.TextIOBase)
+        try:
+            import orjson
+        except ImportError:
+            self._encode = self.__encode_json
+        else:
+            self._orjson = orjson
+            self._encode = self.__encode_orjson
+
+    def __encode_orjson(self, records: list[Any]) -> bytes:
+        dumps, option = self._orjson.dumps, self._orjson.OPT_APPEND_NEWLINE
+        return b"".join(dumps(r, default=_default, option=option) for r in records)
+
+    def __encode_json(self, records: list[Any]) -> bytes:
+        dumps = json.dumps
+        return "".join(dumps(r, default=_default) + "\n" for r in records).encode()
+
+    def write_chunk(self, records: list[Any]) -> None:
+        data = self._encode(records)
+        self._file.write(data.decode() if self._text else data)
+
+
+class CsvSink(Sink):
+    """Writes records as csv rows, with a header of `fieldnames`. Nested values,
+    like lists and dicts, are written as json."""
+
+    def __init__(self, file: Path | str | IO, fieldnames: list[str]) -> None:
+        super().__init__(file)
+        self._writer = csv.writer(self._file)
+        self._fieldnames = fieldnames
+        self._writer.writerow(fieldnames)
+
+    def write_chunk(self, records: list[dict]) -> None:
+        self._writer.writerows(
+            [
+                [
+                    json.dumps(v, default=_default)
+                    if isinstance(v, (dict, list))
+                    else v
+                    for v in map(record.get, self._fieldnames)
+                ]
+                for record in records
+            ]
+        )
+
+
+class ParquetSink(Sink):
+    """Writes records as parquet row groups, one per chunk. Requires pyarrow"""
+
+    binary = True
+
+    def __init__(self, file: Path | str | IO) -> None:
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError("pyarrow is required to write parquet") from e
+        super().__init__(file)
+        self._pa = pyarrow
+        self._writer: Any = None
+
+    def write_chunk(self, records: list[dict]) -> None:
+        table = self._pa.Table.from_pylist(records)
+        if self._writer is None:
+            self._writer = self._pa.parquet.ParquetWriter(self._file, table.schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        super().close()
+
+
+# Formats inferred from file suffixes. Not ".json", which would be expected to
+# hold a single json document rather than json lines
+FORMATS = {".jsonl": "jsonl", ".csv": "csv", ".parquet": "parquet"}
+
+
+def get_sink(
+    file: Path | str | IO, format: str | None = None, builder: Builder | None = None
+) -> Sink:
+    """Returns the sink of a `format` (jsonl, csv or parquet), inferred from the
+    file suffix if not given. Csv headers are the keys of a `DictBuilder`."""
+    if format is None:
+        assert isinstance(file, (str, Path)), "format must be given for open files"
+        suffix = Path(file).suffix
+        assert suffix in FORMATS, f"Can't infer the format of {file=}, pass it"
+        format = FORMATS[suffix]
+    if format == "jsonl":
+        return JsonLinesSink(file)
+    if format == "csv":
+        assert isinstance(builder, DictBuilder), "csv requires a DictBuilder"
+        return CsvSink(file, list(builder.builders))
+    if format == "parquet":
+        return ParquetSink(file)
+    raise ValueError(f"Unknown {format=}, must be one of {set(FORMATS.values())}")
+
+
+def write(
+    builder: Builder,
+    n: int,
+    file: Path | str | IO | None = None,
+    format: str | None = None,
+    chunk_size: int = engine.DEFAULT_SHARD_SIZE,
+    seed: int | None = None,
+    workers: int | None = 1,
+) -> None:
+    """Generates `n` records with `builder` and writes them to `file` (stdout if
+    None) in chunks of `chunk_size` records, so memory stays flat with `n`.
+    Chunks are generated by `randinator.engine`, in `workers` processes."""
+    if file is None:
+        file, format = sys.stdout, format or "jsonl"
+    with get_sink(file, format, builder) as sink:
+        chunks: Iterable[list] = engine.iter_shards(
+            builder, n, seed=seed, workers=workers, shard_size=chunk_size
+        )
+        for chunk in chunks:
+            sink.write_chunk(chunk)
+    _log.debug(f"Wrote {n} records to {file}")
@@ -1,15 +1,19 @@
-
-
 from typing import Optional
 
-from isv2 import PydanticModel
-from isv2.structure.customer.sub_types import PaymentDetailsSchema
-from isv2.structure.meta import Meta
 from pydantic import Field
 
+from randinator import PydanticModel
+from randinator.structure.customer.sub_types import (
+    AddressDetailSchema,
+    ContactSchema,
+    D365DetailsSchema,
+    PaymentDetailsSchema,
+)
+from randinator.structure.meta import Meta
+from randinator.structure.types import UUID4Str
 
-class Customer(PydanticModel):
 
+class Customer(PydanticModel):
     meta: Meta
     customer_uuid: str
     name: str
@@ -23,4 +27,5 @@ class Customer(PydanticModel):
     d365_details: D365DetailsSchema
 
     @property
-    def billing_address(self):
+    def billing_address(self) -> AddressDetailSchema:
+        return self.address_details
@@ -1,6 +1,7 @@
 from typing import Optional
 
-from isv2 import PydanticModel
+from randinator import PydanticModel
+from randinator.structure.types import UUID4Str
 
 
 class PaymentDetailsSchema(PydanticModel):
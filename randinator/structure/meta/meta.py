@@ -1,6 +1,6 @@
 from typing import Literal
 
-from isv2 import PydanticModel
+from randinator import PydanticModel
 
 
 class Meta(PydanticModel):
@@ -0,0 +1,2 @@
+# flake8: noqa
+from .uuid4str import UUID4Str
@@ -0,0 +1,12 @@
+import uuid
+from typing import Annotated
+
+from pydantic import AfterValidator
+
+
+def _coerce_uuid4(value: str) -> str:
+    # Coerce to valid uuid
+    return str(uuid.UUID(value, version=4))
+
+
+UUID4Str = Annotated[str, AfterValidator(_coerce_uuid4)]
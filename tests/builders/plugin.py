@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+from typing import Any
+
+from randinator.builders import Builder
+
+
+@dataclass(kw_only=True)
+class PluginBuilder(Builder):
+    """Builder of a third party package, loaded through an entry point"""
+
+    default: str | None = None
+    default_type: type = str
+
+    def generate(self) -> str:
+        return "plugin"
+
+    def sanitize(self, value: Any) -> Any:
+        return value
@@ -0,0 +1,110 @@
+import copy
+import random
+import time
+
+import pytest
+
+from randinator.builders import (
+    DictBuilder,
+    IntegerBuilder,
+    ListBuilder,
+    NumpyRandom,
+    TextBuilder,
+    Uuid4StrBuilder,
+)
+
+
+def test_seed_is_reproducible(builder):
+    first, second = copy.deepcopy(builder).seed(42), builder.seed(42)
+    assert [first.build() for _ in range(10)] == [second.build() for _ in range(10)]
+    assert first.build_many(10) == second.build_many(10)
+
+
+def test_seed_splits_streams(builder):
+    builder.seed(1)
+    a, b = builder.builders["amount"], builder.builders["values"]
+    assert a.rng is not b.rng
+    assert a.rng is not builder.rng
+    assert b.builder.rng is not None
+
+
+def test_seed_none_restores_global_random(builder):
+    builder.seed(1).seed(None)
+    assert builder.rng is None
+    assert builder.builders["values"].builder.rng is None
+
+
+def test_rng_argument():
+    first = IntegerBuilder(min_value=0, max_value=100, rng=random.Random(3))
+    second = IntegerBuilder(min_value=0, max_value=100, rng=3)
+    assert first.build_many(20) == second.build_many(20)
+    with pytest.raises(TypeError):
+        IntegerBuilder(min_value=0, max_value=100, rng="3")
+
+
+def test_numpy_rng_argument():
+    np = pytest.importorskip("numpy")
+    first = IntegerBuilder(min_value=0, max_value=100, rng=np.random.default_rng(3))
+    second = IntegerBuilder(min_value=0, max_value=100, rng=np.random.default_rng(3))
+    assert isinstance(first.rng, NumpyRandom)
+    assert first.build_many(20) == second.build_many(20)
+    assert all(0 <= v <= 100 for v in first.build_many(20))
+
+
+def test_compile():
+    builder = DictBuilder(
+        builders={
+            "a": IntegerBuilder(min_value=0, max_value=10),
+            "b": ListBuilder(
+                min_length=1,
+                max_length=3,
+                builder=DictBuilder(builders={"c": Uuid4StrBuilder()}),
+            ),
+            "d": IntegerBuilder(min_value=0, max_value=10, default=4),
+            "e": TextBuilder(min_word_number=1, max_word_number=1),
+        }
+    )
+    build = builder.compile()
+    for _ in range(100):
+        value = build()
+        assert list(value) == ["a", "b", "d", "e"]
+        assert 0 <= value["a"] <= 10
+        assert 1 <= len(value["b"]) <= 3
+        assert all(len(v["c"]) == 36 for v in value["b"])
+        assert value["d"] == 4
+        assert value["e"].isalpha()
+
+
+def test_compile_default():
+    builder = ListBuilder(
+        min_length=1, max_length=3, builder=Uuid4StrBuilder(), default=["a"]
+    )
+    assert builder.compile()() == ["a"]
+
+
+def test_compile_is_reproducible(builder):
+    first = copy.deepcopy(builder).seed(5).compile()
+    second = builder.seed(5).compile()
+    assert [first() for _ in range(10)] == [second() for _ in range(10)]
+
+
+def test_iter_build():
+    builder = IntegerBuilder(min_value=0, max_value=10, rng=1)
+    values = builder.iter_build(10, chunk_size=3)
+    assert not isinstance(values, list)
+    assert list(values) == IntegerBuilder(min_value=0, max_value=10, rng=1).build_many(
+        10
+    )
+    assert list(builder.iter_build(0)) == []
+
+
+def test_iter_build_endless(builder):
+    values = builder.iter_build(chunk_size=4)
+    assert len([next(values) for _ in range(10)]) == 10
+
+
+def test_iter_build_rate():
+    builder = IntegerBuilder(min_value=0, max_value=10)
+    start = time.monotonic()
+    assert len(list(builder.iter_build(11, rate=100))) == 11
+    assert time.monotonic() - start >= 0.1
@@ -1,5 +1,16 @@
-from randinator.builders import DictBuilder, ListBuilder, PicklistBuilder
+import random
+
+import pytest
+
+from randinator.builders import (
+    DictBuilder,
+    ListBuilder,
+    ListColumn,
+    NullableBuilder,
+    PicklistBuilder,
+)
 from randinator.builders.numbers import IntegerBuilder
+from randinator.data import load_corpus
 
 
 def test_list_builder():
@@ -29,3 +40,213 @@ def test_picklist_builder():
         value = builder.build()
         assert isinstance(value, str)
         assert value in ["a", "b", "c"]
+
+
+def test_picklist_builder_build_many():
+    values = PicklistBuilder(picklist=["a", "b", "c"]).build_many(100)
+    assert len(values) == 100
+    assert set(values) == {"a", "b", "c"}
+
+
+def test_list_builder_build_many():
+    builder = ListBuilder(
+        min_length=1, max_length=5, builder=IntegerBuilder(min_value=0, max_value=10)
+    )
+    values = builder.build_many(10)
+    assert len(values) == 10
+    assert all(isinstance(v, list) and 1 <= len(v) <= 5 for v in values)
+
+
+def test_list_builder_build_many_nested():
+    builder = ListBuilder(
+        min_length=0,
+        max_length=3,
+        builder=ListBuilder(
+            min_length=1, max_length=2, builder=IntegerBuilder(min_value=0, max_value=9)
+        ),
+    )
+    values = builder.seed(4).build_many(500)
+    assert {len(v) for v in values} == {0, 1, 2, 3}
+    assert all(1 <= len(inner) <= 2 for v in values for inner in v)
+    assert {i for v in values for inner in v for i in inner} == set(range(10))
+    assert builder.seed(4).build_many(500) == values
+
+
+def test_list_builder_build_offsets():
+    builder = ListBuilder(
+        min_length=0, max_length=4, builder=IntegerBuilder(min_value=0, max_value=10)
+    )
+    offsets, values = builder.seed(2).build_offsets(100)
+    assert len(offsets) == 101 and offsets[0] == 0 and offsets[-1] == len(values)
+    lists = [values[start:end] for start, end in zip(offsets, offsets[1:])]
+    assert lists == builder.seed(2).build_many(100)
+
+    np = pytest.importorskip("numpy")
+    offsets, values = builder.build_offsets(100, as_array=True)
+    assert offsets.dtype == np.int64 and values.dtype == np.int64
+    assert offsets[-1] == len(values)
+
+    builder = ListBuilder(
+        builder=IntegerBuilder(min_value=0, max_value=1), default=[1, 2]
+    )
+    assert builder.build_offsets(3) == ([0, 2, 4, 6], [1, 2, 1, 2, 1, 2])
+
+
+def test_list_builder_to_arrow():
+    pytest.importorskip("pyarrow")
+    builder = ListBuilder(
+        min_length=0, max_length=4, builder=IntegerBuilder(min_value=0, max_value=10)
+    ).seed(0)
+    array = ListBuilder.to_arrow(*builder.build_offsets(10, as_array=True))
+    assert array.to_pylist() == builder.seed(0).build_many(10)
+
+
+def test_dict_builder_build_columns():
+    builder = DictBuilder(
+        builders={
+            "a": IntegerBuilder(min_value=0, max_value=10),
+            "b": PicklistBuilder(picklist=["x", "y"]),
+        }
+    )
+    columns = builder.build_columns(50)
+    assert list(columns) == ["a", "b"]
+    assert all(len(column) == 50 for column in columns.values())
+    assert all(0 <= v <= 10 for v in columns["a"])
+    assert set(columns["b"]) <= {"x", "y"}
+
+    rows = DictBuilder.to_rows(columns)
+    assert len(rows) == 50
+    assert rows[3] == {"a": columns["a"][3], "b": columns["b"][3]}
+
+
+@pytest.mark.parametrize("length", [0, 2])
+def test_dict_builder_build_columns_of_lists(length):
+    np = pytest.importorskip("numpy")
+    items = IntegerBuilder(min_value=0, max_value=10)
+    builder = DictBuilder(
+        builders={
+            "a": ListBuilder(min_length=length, max_length=length, builder=items),
+            "b": IntegerBuilder(min_value=0, max_value=10),
+        }
+    )
+    columns = builder.build_columns(4, as_array=True)
+    assert isinstance(columns["a"], ListColumn) and len(columns["a"]) == 4
+    assert columns["a"].offsets.dtype == np.int64
+    rows = DictBuilder.to_rows(columns)
+    assert all(isinstance(row["a"], list) and len(row["a"]) == length for row in rows)
+    values = builder.builders["a"].build_many(4, as_array=True)
+    assert isinstance(values, np.ndarray) and values.shape == (4,)
+
+
+def test_dict_builder_build_columns_list_column():
+    builder = DictBuilder(
+        builders={
+            "a": ListBuilder(
+                min_length=0,
+                max_length=3,
+                builder=IntegerBuilder(min_value=0, max_value=9),
+            )
+        }
+    )
+    lists = [record["a"] for record in builder.seed(3).build_many(20)]
+    column = builder.seed(3).build_columns(20)["a"]
+    assert isinstance(column, ListColumn)
+    assert list(column) == lists
+    assert [column[i] for i in range(-20, 20)] == lists + lists
+    assert column[2:5] == lists[2:5]
+    with pytest.raises(IndexError):
+        column[20]
+
+
+def test_dict_builder_to_arrow():
+    pytest.importorskip("pyarrow")
+    builder = DictBuilder(
+        builders={
+            "a": ListBuilder(
+                min_length=0,
+                max_length=3,
+                builder=IntegerBuilder(min_value=0, max_value=9),
+            ),
+            "b": IntegerBuilder(min_value=0, max_value=9),
+        }
+    )
+    columns = builder.seed(0).build_columns(10, as_array=True)
+    table = DictBuilder.to_arrow(columns)
+    assert table.to_pylist() == DictBuilder.to_rows(columns)
+
+
+def test_dict_builder_build_many():
+    builder = DictBuilder(
+        builders={
+            "a": DictBuilder(builders={"b": IntegerBuilder(min_value=0, max_value=1)})
+        }
+    )
+    values = builder.build_many(10)
+    assert len(values) == 10
+    assert all(v["a"]["b"] in (0, 1) for v in values)
+    assert DictBuilder(builders={}).build_many(2) == [{}, {}]
+
+
+def test_dict_builder_build_columns_default():
+    builder = DictBuilder(builders={}, default={"a": 1})
+    assert builder.build_columns(2) == {"a": [1, 1]}
+
+
+def test_nullable_builder():
+    builder = NullableBuilder(
+        builder=IntegerBuilder(min_value=0, max_value=10), null_probability=0.5
+    ).seed(0)
+    values = builder.build_many(1000) + [builder.build() for _ in range(100)]
+    assert None in values
+    assert all(v is None or 0 <= v <= 10 for v in values)
+    assert 300 < values.count(None) < 800
+    assert (
+        NullableBuilder(
+            builder=IntegerBuilder(min_value=1, max_value=1), null_probability=0.0
+        ).build_many(10)
+        == [1] * 10
+    )
+
+
+@pytest.mark.parametrize("size", [5, 1000])
+def test_weighted_picklist_builder(size):
+    picklist = [str(i) for i in range(size)]
+    weights = [0.0] * size
+    weights[0], weights[-1], weights[size // 2] = 8.0, 1.0, 1.0
+    builder = PicklistBuilder(picklist=picklist, weights=weights).seed(0)
+    for values in (
+        builder.build_many(20_000),
+        [builder.build() for _ in range(20_000)],
+    ):
+        assert set(values) == {"0", str(size - 1), str(size // 2)}
+        assert 0.78 < values.count("0") / len(values) < 0.82
+
+
+def test_weighted_picklist_builder_alias_table():
+    weights = [random.random() for _ in range(100)]
+    builder = PicklistBuilder(picklist=range(100), weights=weights)
+    # Each item's share of the alias table slots matches its weight
+    shares = [0.0] * 100
+    for i, (threshold, alias) in enumerate(zip(builder._thresholds, builder._aliases)):
+        shares[i] += threshold - i
+        shares[alias] += 1 - (threshold - i)
+    total = sum(weights)
+    assert all(abs(s / 100 - w / total) < 1e-9 for s, w in zip(shares, weights))
+
+
+def test_weighted_picklist_builder_corpus(tmp_path):
+    filepath = tmp_path / "words.txt"
+    filepath.write_text("\n".join(f"word{i}" for i in range(100_000)))
+    corpus = load_corpus(filepath, mmap_threshold=0)
+    weights = [1.0 if i % 2 else 0.0 for i in range(len(corpus))]
+    values = PicklistBuilder(picklist=corpus, weights=weights).build_many(1000)
+    assert all(int(value[4:]) % 2 for value in values)
+
+
+def test_weighted_picklist_builder_invalid_weights():
+    with pytest.raises(AssertionError):
+        PicklistBuilder(picklist=["a", "b"], weights=[1.0])
+    with pytest.raises(AssertionError):
+        PicklistBuilder(picklist=["a", "b"], weights=[0.0, 0.0])
+    with pytest.raises(AssertionError):
+        PicklistBuilder(picklist=["a", "b"], weights=[-1.0, 2.0])
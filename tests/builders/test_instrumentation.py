@@ -0,0 +1,105 @@
+import json
+import logging
+
+from randinator.builders import (
+    Builder,
+    DictBuilder,
+    IntegerBuilder,
+    ListBuilder,
+    disable_instrumentation,
+    enable_instrumentation,
+    format_profile,
+    get_profile,
+    instrumented,
+    is_instrumented,
+    reset_profile,
+)
+
+INTEGER = "randinator.builders.numbers.IntegerBuilder"
+DICT = "randinator.builders.containers.DictBuilder"
+LIST = "randinator.builders.containers.ListBuilder"
+
+
+def test_instrumentation_is_swapped_in_and_out():
+    build, build_offsets = Builder.build, ListBuilder.build_offsets
+    with instrumented():
+        assert is_instrumented()
+        assert Builder.build is not build
+        assert ListBuilder.build_offsets is not build_offsets
+    assert not is_instrumented()
+    assert Builder.build is build
+    assert ListBuilder.build_offsets is build_offsets
+    disable_instrumentation()
+    assert Builder.build is build
+
+
+def test_profile():
+    reset_profile()
+    builder = DictBuilder(
+        builders={
+            "a": IntegerBuilder(min_value=0, max_value=10),
+            "b": IntegerBuilder(min_value=0, max_value=10, default=1),
+        }
+    )
+    with instrumented():
+        builder.build()
+        builder.build_many(10)
+    builder.build()  # Not counted
+
+    profile = get_profile()
+    assert list(profile) == [DICT, INTEGER]
+    assert profile[DICT]["calls"] == 2
+    assert profile[DICT]["values"] == 11
+    assert profile[INTEGER]["calls"] == 4
+    assert profile[INTEGER]["values"] == 22
+    assert profile[INTEGER]["defaults"] == 11
+    assert json.loads(format_profile(as_json=True)) == profile
+    assert INTEGER in format_profile()
+
+    reset_profile()
+    assert get_profile() == {}
+
+
+def test_sampled_logging(caplog):
+    builder = IntegerBuilder(min_value=0, max_value=10)
+    with caplog.at_level(logging.DEBUG, "randinator.builders.instrumentation"):
+        builder.build()
+        with instrumented(log_rate=1.0):
+            builder.build()
+            builder.build_many(3)
+        with instrumented(log_rate=0.0):
+            builder.build()
+    assert len(caplog.records) == 2
+
+
+def test_enable_instrumentation_twice():
+    build = Builder.build
+    enable_instrumentation()
+    enable_instrumentation()
+    disable_instrumentation()
+    assert Builder.build is build
+
+
+def test_profile_columns():
+    reset_profile()
+    builder = DictBuilder(
+        builders={
+            "a": IntegerBuilder(min_value=0, max_value=10),
+            "b": ListBuilder(
+                min_length=2,
+                max_length=2,
+                builder=IntegerBuilder(min_value=0, max_value=10),
+            ),
+        }
+    )
+    with instrumented():
+        builder.build_columns(10)
+        builder.build_many(5)  # Lists counted once, not through `build_offsets`
+
+    profile = get_profile()
+    assert profile[DICT]["calls"] == 2
+    assert profile[DICT]["values"] == 15
+    assert profile[LIST]["calls"] == 2
+    assert profile[LIST]["values"] == 15
+    assert profile[INTEGER]["calls"] == 4
+    assert profile[INTEGER]["values"] == 10 + 20 + 5 + 10
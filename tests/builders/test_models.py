@@ -0,0 +1,115 @@
+from decimal import Decimal
+from typing import Annotated, Literal
+
+import pytest
+from pydantic import Field
+
+from randinator import PydanticModel
+from randinator.builders import ModelBuilder, TreeProfiler, builder_for
+from randinator.structure.customer import Customer
+from randinator.structure.types import UUID4Str
+
+
+class Line(PydanticModel):
+    sku: UUID4Str
+    quantity: int = Field(ge=1, le=5)
+    price: Decimal = Field(gt=0, lt=100)
+    discount: float | None = None
+
+
+class Invoice(PydanticModel):
+    number: int
+    status: Literal["open", "paid"]
+    paid: bool
+    lines: list[Line]
+    notes: list[Annotated[str, Field(max_length=100)]]
+
+
+def test_builder_for_builds_valid_data():
+    records = builder_for(Invoice).build_many(200)
+    invoices = Invoice.validate_many(records)
+    assert len(invoices) == 200
+    lines = [line for invoice in invoices for line in invoice.lines]
+    assert all(1 <= line.quantity <= 5 for line in lines)
+    assert all(0 < line.price < 100 for line in lines)
+    assert any(line.discount is None for line in lines)
+
+
+def test_builder_for_is_cached():
+    assert builder_for(Invoice) is builder_for(Invoice)
+    lines = builder_for(Invoice).builders["lines"].builder
+    assert lines == builder_for(Line) and lines is not builder_for(Line)
+
+
+def test_builder_for_nested_models_are_not_shared():
+    class Shipment(PydanticModel):
+        first: Line
+        second: Line
+
+    builder = builder_for(Shipment)
+    assert builder.builders["first"] is not builder.builders["second"]
+    with TreeProfiler(builder, name="shipment") as profiler:
+        builder.build()
+    assert profiler.stats["shipment.second.sku"].calls == 1
+
+
+def test_builder_for_customer():
+    records = builder_for(Customer).build_many(50)
+    assert len(Customer.validate_many(records)) == 50
+
+
+def test_builder_for_unsupported_type():
+    class Unsupported(PydanticModel):
+        value: int | str
+
+    with pytest.raises(TypeError, match="union"):
+        builder_for(Unsupported)
+
+
+class Constrained(PydanticModel):
+    code: str = Field(max_length=3)
+    name: str = Field(min_length=20, max_length=30, strict=True)
+    summary: str = Field(min_length=50)
+    tags: list[int] = Field(min_length=5)
+    scores: list[float] | None = Field(min_length=1, max_length=2)
+    amount: Decimal = Field(gt=0, max_digits=4, decimal_places=1)
+
+
+def test_builder_for_honors_lengths():
+    records = builder_for(Constrained).build_many(500)
+    assert len(Constrained.validate_many(records)) == 500
+    assert all(len(record["tags"]) >= 5 for record in records)
+
+
+@pytest.mark.parametrize(
+    "field",
+    [
+        Field(pattern="^[A-Z]+$"),
+        Field(max_length=0),
+        Field(min_length=3, max_length=2),
+    ],
+)
+def test_builder_for_unsupported_str_constraint(field):
+    class Unsupported(PydanticModel):
+        value: str = field
+
+    with pytest.raises(TypeError, match=r"Unsupported'>\.value"):
+        builder_for(Unsupported)
+
+
+def test_builder_for_unsupported_number_constraint():
+    class Unsupported(PydanticModel):
+        value: int = Field(multiple_of=7)
+
+    with pytest.raises(TypeError, match="multiple_of=7"):
+        builder_for(Unsupported)
+
+
+def test_model_builder():
+    builder = ModelBuilder(model=Invoice).seed(1)
+    invoices = builder.build_many(20)
+    assert all(isinstance(invoice, Invoice) for invoice in invoices)
+    assert ModelBuilder(model=Invoice).seed(1).build_many(20) == invoices
+    assert builder_for(Invoice).rng is None  # The cached tree isn't seeded
+    validated = ModelBuilder(model=Invoice, validate=True).build()
+    assert isinstance(validated, Invoice)
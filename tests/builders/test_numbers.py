@@ -1,5 +1,7 @@
 from decimal import Decimal
 
+import pytest
+
 from randinator.builders import (
     BooleanBuilder,
     DecimalBuilder,
@@ -8,6 +10,7 @@ from randinator.builders import (
     IntegerBuilder,
     IntegerStrBuilder,
     PercentageBuilder,
+    numbers,
 )
 
 
@@ -64,3 +67,95 @@ def test_boolean_builder_values():
     for _ in range(100):
         value = builder.build()
         assert isinstance(value, bool)
+
+
+def test_integer_builder_build_many():
+    builder = IntegerBuilder(min_value=0, max_value=10)
+    values = builder.build_many(1000)
+    assert len(values) == 1000
+    assert all(isinstance(v, int) and 0 <= v <= 10 for v in values)
+    assert set(values) == set(range(11))
+
+
+def test_integer_builder_build_many_large_span():
+    builder = IntegerBuilder(min_value=0, max_value=2**64)
+    values = builder.build_many(100)
+    assert all(0 <= v <= 2**64 for v in values)
+
+
+def test_integer_str_builder_build_many():
+    values = IntegerStrBuilder(min_value=0, max_value=10).build_many(100)
+    assert all(isinstance(v, str) and 0 <= int(v) <= 10 for v in values)
+
+
+def test_float_builder_build_many():
+    builder = FloatBuilder(min_value=1.0, max_value=2.0, decimal_places=1)
+    values = builder.build_many(100)
+    assert all(isinstance(v, float) and 1.0 <= v <= 2.0 for v in values)
+    assert all(v == round(v, 1) for v in values)
+
+
+def test_float_builder_build_many_without_numpy(monkeypatch):
+    pytest.importorskip("numpy")
+    builder = FloatStrBuilder(min_value=-5.0, max_value=7.5, decimal_places=3)
+    with_numpy = builder.seed(1).build_many(1000)
+    monkeypatch.setattr(numbers, "_numpy", lambda: None)
+    assert builder.seed(1).build_many(1000) == with_numpy
+    builder.seed(1)
+    assert [builder.build() for _ in range(1000)] == with_numpy
+
+
+def test_float_builder_build_many_as_array():
+    np = pytest.importorskip("numpy")
+    builder = FloatBuilder(min_value=1.0, max_value=2.0, decimal_places=1)
+    values = builder.seed(2).build_many(100, as_array=True)
+    assert values.dtype == np.float64
+    assert values.tolist() == builder.seed(2).build_many(100)
+    values = FloatStrBuilder(min_value=1.0, max_value=2.0).build_many(
+        100, as_array=True
+    )
+    assert values.dtype == object and isinstance(values[0], str)
+
+
+def test_decimal_builder_build_many():
+    values = DecimalBuilder(min_value=0.0, max_value=10.0).build_many(100)
+    assert all(isinstance(v, Decimal) and 0 <= v <= 10 for v in values)
+
+
+def test_boolean_builder_build_many():
+    values = BooleanBuilder().build_many(100)
+    assert all(isinstance(v, bool) for v in values)
+    assert set(values) == {True, False}
+
+
+def test_build_many_default():
+    assert IntegerBuilder(min_value=0, max_value=10, default=3).build_many(3) == [3] * 3
+    assert BooleanBuilder().build_many(0) == []
+
+
+def test_build_many_as_array():
+    np = pytest.importorskip("numpy")
+    values = IntegerBuilder(min_value=0, max_value=10).build_many(10, as_array=True)
+    assert isinstance(values, np.ndarray)
+    assert values.shape == (10,)
+    assert values.dtype.kind == "i"
+
+
+def test_decimal_builder_places():
+    builder = DecimalBuilder(min_value=0.005, max_value=0.03, decimal_places=2)
+    values = builder.build_many(500) + [builder.build() for _ in range(100)]
+    assert set(values) == {Decimal("0.01"), Decimal("0.02"), Decimal("0.03")}
+    assert all(v.as_tuple().exponent == -2 for v in values)
+
+    builder = DecimalBuilder(min_value=-5, max_value=5, decimal_places=0)
+    assert set(builder.build_many(500)) == {Decimal(i) for i in range(-5, 6)}
+
+    with pytest.raises(AssertionError):
+        DecimalBuilder(min_value=0.001, max_value=0.004, decimal_places=2)
+
+
+def test_decimal_builder_sanitize():
+    builder = DecimalBuilder(min_value=0, max_value=10)
+    assert builder.sanitize(1.005) == Decimal("1.00")  # 1.005 is 1.00499... as float
+    assert builder.sanitize("1.005") == Decimal("1.01")
+    assert builder.sanitize(Decimal("2")) == Decimal("2.00")
@@ -0,0 +1,84 @@
+import json
+
+from randinator.builders import (
+    DictBuilder,
+    IntegerBuilder,
+    ListBuilder,
+    TreeProfiler,
+    Uuid4StrBuilder,
+)
+
+
+def make_tree() -> DictBuilder:
+    return DictBuilder(
+        builders={
+            "id": Uuid4StrBuilder(),
+            "contacts": ListBuilder(
+                min_length=2,
+                max_length=2,
+                builder=DictBuilder(
+                    builders={"age": IntegerBuilder(min_value=0, max_value=99)}
+                ),
+            ),
+        }
+    )
+
+
+def test_tree_profiler():
+    builder = make_tree()
+    with TreeProfiler(builder, name="customer") as profiler:
+        builder.build()
+        builder.build_many(3)
+    assert "build" not in vars(builder)
+
+    stats = profiler.stats
+    assert set(stats) == {
+        "customer",
+        "customer.id",
+        "customer.contacts",
+        "customer.contacts[]",
+        "customer.contacts[].age",
+    }
+    assert stats["customer"].calls == 2
+    assert stats["customer"].values == 4
+    assert stats["customer.contacts[].age"].values == 2 + 3 * 2
+    assert stats["customer"].total_ns >= stats["customer.contacts"].total_ns
+
+    report = profiler.report()
+    assert [row["self_ns"] for row in report] == sorted(
+        (row["self_ns"] for row in report), reverse=True
+    )
+    assert abs(sum(row["share"] for row in report) - 1) < 1e-9
+    assert json.loads(profiler.format_report(as_json=True)) == report
+    assert "customer.contacts[].age" in profiler.format_report()
+
+
+def test_tree_profiler_sampling():
+    builder = make_tree()
+    with TreeProfiler(builder, sample_rate=0.0) as profiler:
+        for _ in range(10):
+            builder.build()
+    assert profiler.report() == []
+
+    with TreeProfiler(builder, sample_rate=0.5) as profiler:
+        for _ in range(1000):
+            builder.build()
+    assert 300 < profiler.stats["root"].calls < 700
+    assert profiler.stats["root.id"].calls == profiler.stats["root"].calls
+
+
+def test_tree_profiler_columns():
+    builder = make_tree()
+    with TreeProfiler(builder, name="customer") as profiler:
+        builder.build_columns(3)
+    assert "build_columns" not in vars(builder)
+    assert "build_offsets" not in vars(builder.builders["contacts"])
+
+    stats = profiler.stats
+    assert stats["customer"].calls == 1
+    assert stats["customer"].values == 3
+    assert stats["customer.contacts"].calls == 1
+    assert stats["customer.contacts"].values == 3
+    assert stats["customer.contacts[]"].values == 3 * 2
+    assert stats["customer.contacts[].age"].values == 3 * 2
+    assert stats["customer.contacts"].total_ns >= stats["customer.contacts[]"].total_ns
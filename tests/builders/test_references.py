@@ -0,0 +1,106 @@
+import copy
+import pickle
+
+import pytest
+
+from randinator import engine
+from randinator.builders import (
+    DictBuilder,
+    IntegerBuilder,
+    ListBuilder,
+    ModelBuilder,
+    ReferenceBuilder,
+    Uuid4StrBuilder,
+    builder_for,
+)
+from randinator.data import KeyIndex
+from randinator.structure.customer import Customer
+
+
+def make_customer_builder() -> DictBuilder:
+    return DictBuilder(
+        builders={
+            "contacts": ListBuilder(
+                min_length=0,
+                max_length=3,
+                builder=DictBuilder(builders={"uuid": Uuid4StrBuilder()}),
+            ),
+            "primary_contact_id": ReferenceBuilder(path="contacts[].uuid"),
+        }
+    )
+
+
+def check_customers(customers: list[dict]) -> None:
+    for customer in customers:
+        uuids = [contact["uuid"] for contact in customer["contacts"]]
+        if uuids:
+            assert customer["primary_contact_id"] in uuids
+        else:
+            assert customer["primary_contact_id"] is None
+
+
+def test_sibling_reference():
+    builder = make_customer_builder().seed(0)
+    check_customers([builder.build() for _ in range(100)])
+    check_customers(builder.build_many(100))
+    build = builder.compile()
+    check_customers([build() for _ in range(100)])
+    assert list(builder.build()) == ["contacts", "primary_contact_id"]
+
+
+def test_sibling_reference_errors():
+    with pytest.raises(AssertionError, match="references a missing key"):
+        DictBuilder(builders={"a": ReferenceBuilder(path="b")})
+    with pytest.raises(TypeError, match="resolved by its parent"):
+        ReferenceBuilder(path="b").build()
+    with pytest.raises(AssertionError):
+        ReferenceBuilder()
+
+
+def test_customer_model_references_its_contacts():
+    builder = ModelBuilder(model=Customer, validate=True)
+    builder._builder.builders["primary_contact_id"] = ReferenceBuilder(
+        path="contacts[].uuid"
+    )
+    builder._builder.builders["contacts"].min_length = 1
+    for customer in builder.build_many(50):
+        assert customer.primary_contact_id in [c.uuid for c in customer.contacts]
+    cached = builder_for(Customer).builders["primary_contact_id"]
+    assert not isinstance(cached, ReferenceBuilder)
+
+
+@pytest.mark.parametrize("max_bytes", [10, 1024**2])
+def test_key_index(tmp_path, max_bytes):
+    keys = [f"key-{i}" for i in range(1000)]
+    index = KeyIndex(keys, max_bytes=max_bytes, directory=tmp_path)
+    assert len(index) == 1000
+    assert list(index) == keys
+    assert index[0] == "key-0" and index[-1] == "key-999"
+    assert index[10:13] == keys[10:13]
+    assert (index.filepath is not None) == (max_bytes == 10)
+    assert index.nbytes < sum(map(len, keys)) + 8 * 1000 + 100
+    copied = pickle.loads(pickle.dumps(index))
+    assert list(copied) == keys
+    assert copy.deepcopy(index) is index
+
+
+def test_key_index_spill_file_is_removed(tmp_path):
+    index = KeyIndex(range(100), max_bytes=16, directory=tmp_path)
+    assert index[42] == 42
+    assert len(list(tmp_path.iterdir())) == 1
+    del index
+    assert not list(tmp_path.iterdir())
+
+
+def test_index_reference(tmp_path):
+    customers = DictBuilder(
+        builders={"id": IntegerBuilder(min_value=0, max_value=10**9)}
+    )
+    index = KeyIndex(max_bytes=256, directory=tmp_path)
+    for customer in engine.iter_records(customers, 500, seed=1, workers=1):
+        index.add(customer["id"])
+    orders = DictBuilder(builders={"customer_id": ReferenceBuilder(index=index)})
+    ids = set(index)
+    for workers in (1, 2):
+        records = engine.generate(orders, 200, seed=2, workers=workers, shard_size=50)
+        assert all(order["customer_id"] in ids for order in records)
@@ -0,0 +1,118 @@
+import importlib
+import subprocess
+import sys
+from dataclasses import dataclass
+from importlib.metadata import EntryPoint
+from typing import Any
+
+import pytest
+
+import randinator.builders
+from randinator.builders import Builder, IntegerBuilder, base
+
+
+def test_get_builder_by_name():
+    assert base.get_builder("integer") is IntegerBuilder
+    assert base.get_builder("IntegerBuilder") is IntegerBuilder
+    assert base.get_builder("integer_str").__name__ == "IntegerStrBuilder"
+    assert base.get_builder("uuid4_str").__name__ == "Uuid4StrBuilder"
+
+
+def test_get_builder_from_config():
+    builder = base.get_builder("integer")(min_value=3, max_value=3)
+    assert builder.build() == 3
+
+
+def test_get_builder_unknown():
+    with pytest.raises(KeyError, match="no_such"):
+        base.get_builder("no_such")
+
+
+def test_get_builders_loads_builtins():
+    names = base.get_builder_names()
+    assert {"list", "dict", "integer", "text", "date_str", "model"} <= set(names)
+    assert all(issubclass(cls, Builder) for cls in base.get_builders().values())
+
+
+def test_builtin_builders_match_modules():
+    builders = base.get_builders()
+    for name, module in base.BUILTIN_BUILDERS.items():
+        assert builders[name].__module__ == module
+    assert {
+        name
+        for name, cls in builders.items()
+        if cls.__module__.startswith("randinator.")
+    } == set(base.BUILTIN_BUILDERS)
+
+
+def test_get_builder_imports_only_its_module():
+    code = (
+        "import sys; from randinator.builders import get_builder; "
+        "get_builder('date_str'); "
+        "print(sorted(m for m in sys.modules "
+        "if m.startswith(('randinator', 'pydantic', 'importlib.metadata'))))"
+    )
+    modules = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert "randinator.builders.text" in modules
+    assert "randinator.builders.models" not in modules
+    assert "pydantic" not in modules
+    assert "importlib.metadata" not in modules
+
+
+def test_register_twice():
+    with pytest.raises(ValueError, match="already registered"):
+        base.register(IntegerBuilder)
+
+
+def test_register_same_name():
+    with pytest.raises(ValueError, match="same name='integer'"):
+
+        @dataclass(kw_only=True)
+        class IntegerBuilder(Builder):  # noqa: F811
+            def generate(self) -> Any:
+                return 0
+
+            def sanitize(self, value: Any) -> Any:
+                return value
+
+
+def test_plugins_are_loaded(monkeypatch):
+    entry_point = EntryPoint(
+        name="plugin",
+        value="tests.builders.plugin:PluginBuilder",
+        group=base.ENTRY_POINT_GROUP,
+    )
+    broken = EntryPoint(
+        name="broken", value="no_such_module:Builder", group=base.ENTRY_POINT_GROUP
+    )
+    monkeypatch.setattr(
+        importlib.metadata, "entry_points", lambda group: [broken, entry_point]
+    )
+    monkeypatch.setattr(base, "__loaded", False)
+    assert base.get_builder("plugin")().build() == "plugin"
+
+
+def test_exports_match_modules():
+    for name, module in randinator.builders._EXPORTS.items():
+        module = importlib.import_module(f"randinator.builders.{module}")
+        assert name in module.__all__
+        assert getattr(randinator.builders, name) is getattr(module, name)
+    with pytest.raises(AttributeError):
+        randinator.builders.NoSuchBuilder
+
+
+def test_imports_are_lazy():
+    code = (
+        "import sys, randinator.engine; "
+        "from randinator.builders import IntegerBuilder; "
+        "print(sorted(m for m in sys.modules "
+        "if m.startswith(('randinator', 'pydantic'))))"
+    )
+    modules = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert "randinator.builders.numbers" in modules
+    assert "randinator.builders.text" not in modules
+    assert "pydantic" not in modules
@@ -1,9 +1,18 @@
+import os
+import pickle
 import uuid
+from collections import Counter
+from datetime import date
 
 import pytest
 
-from randinator.builders import FileTextBuilder, TextBuilder, Uuid4StrBuilder
-from randinator.builders.text import DateStrBuilder
+from randinator.builders import (
+    FileTextBuilder,
+    TextBuilder,
+    Uuid4StrBuilder,
+    uuid4_strs,
+)
+from randinator.builders.text import UUID4_BLOCK_SIZE, DateStrBuilder
 
 
 def test_text_builder():
@@ -59,3 +68,160 @@ def test_date_str_builder_valid_date():
         assert value[4] == "-"
         assert value[7] == "-"
         assert isinstance(builder.sanitize(value), str)
+
+
+def test_uuid4_str_builder_build_many():
+    values = Uuid4StrBuilder().build_many(100)
+    assert len(set(values)) == 100
+    for value in values:
+        assert str(uuid.UUID(value, version=4)) == value
+        assert uuid.UUID(value).version == 4
+        assert uuid.UUID(value).variant == uuid.RFC_4122
+
+
+def test_file_text_builder_skips_blank_lines(tmp_path):
+    file = tmp_path / "test.txt"
+    file.write_text("\nhi\n\n  \nbye\n")
+    builder = FileTextBuilder(filepath=file, min_word_number=5, max_word_number=5)
+    for _ in range(20):
+        assert all(word in ("hi", "bye") for word in builder.build().split(" "))
+
+
+def test_file_text_builder_shares_word_index(tmp_path):
+    file = tmp_path / "test.txt"
+    file.write_text("hi\nhello\n")
+    first = FileTextBuilder(filepath=file, min_word_number=1, max_word_number=5)
+    second = FileTextBuilder(filepath=str(file), min_word_number=1, max_word_number=2)
+    assert first._words is second._words
+    assert tuple(first._words) == ("hi", "hello")
+
+
+def test_file_text_builder_build_many(tmp_path):
+    file = tmp_path / "test.txt"
+    file.write_text("hi\nhello\n")
+    builder = FileTextBuilder(
+        filepath=file, min_word_number=1, max_word_number=3, pre_word="<"
+    )
+    texts = builder.build_many(50)
+    assert len(texts) == 50
+    for text in texts:
+        pre, *words = text.split(" ")
+        assert pre == "<"
+        assert 1 <= len(words) <= 3
+        assert all(word in ("hi", "hello") for word in words)
+
+
+def test_text_builder_build_many():
+    builder = TextBuilder(
+        min_word_number=1, max_word_number=3, min_length=2, max_length=4, post_word="!"
+    )
+    texts = builder.build_many(200)
+    assert len(texts) == 200
+    for text in texts:
+        *words, post = text.split(" ")
+        assert post == "!"
+        assert 1 <= len(words) <= 3
+        assert all(2 <= len(word) <= 4 and word.isalpha() for word in words)
+    lengths = {len(word) for text in texts for word in text.split(" ")[:-1]}
+    assert lengths == {2, 3, 4}
+
+
+def test_text_builder_as_bytes():
+    builder = TextBuilder(min_word_number=1, max_word_number=3, as_bytes=True)
+    assert isinstance(builder.build(), bytes)
+    assert all(isinstance(text, bytes) for text in builder.build_many(10))
+    builder = TextBuilder(
+        min_word_number=1, max_word_number=3, as_bytes=True, default=b"hi"
+    )
+    assert builder.build() == b"hi"
+
+
+def test_date_str_builder_constraints():
+    builder = DateStrBuilder(month=2, day=29)
+    for value in builder.build_many(100):
+        parsed = date.fromisoformat(value)
+        assert (parsed.month, parsed.day) == (2, 29)
+        assert 1970 <= parsed.year <= 2999
+
+    builder = DateStrBuilder(year=2023, month=2)
+    assert {date.fromisoformat(v).day for v in builder.build_many(1000)} == set(
+        range(1, 29)
+    )
+
+    builder = DateStrBuilder(day=31, min_date="2023-01-01", max_date=date(2023, 12, 31))
+    assert set(builder.build_many(1000)) == {
+        f"2023-{month:02d}-31" for month in (1, 3, 5, 7, 8, 10, 12)
+    }
+
+    with pytest.raises(ValueError):
+        DateStrBuilder(year=2023, month=2, day=29)
+    with pytest.raises(AssertionError):
+        DateStrBuilder(year=2023, min_date="2024-01-01")
+
+
+def test_date_str_builder_is_uniform_over_days():
+    builder = DateStrBuilder(year=2023, month=1, rng=1)
+    counts = Counter(builder.build_many(31_000))
+    assert len(counts) == 31
+    assert all(800 < count < 1200 for count in counts.values())
+
+
+def test_date_str_builder_bounds():
+    builder = DateStrBuilder(min_date="2020-02-27", max_date="2020-03-01")
+    assert set(builder.build_many(200)) == {
+        "2020-02-27",
+        "2020-02-28",
+        "2020-02-29",
+        "2020-03-01",
+    }
+    assert builder.build() in builder.build_many(200)
+
+
+def test_date_str_builder_fixed_year_out_of_default_range():
+    for year in (1960, 3005):
+        values = DateStrBuilder(year=year).build_many(100)
+        assert {date.fromisoformat(v).year for v in values} == {year}
+    assert DateStrBuilder(year=1960, month=2, day=29).build() == "1960-02-29"
+    builder = DateStrBuilder(year=1960, max_date="1960-01-02")
+    assert set(builder.build_many(100)) == {"1960-01-01", "1960-01-02"}
+
+
+def test_date_str_builder_bounds_out_of_default_range():
+    builder = DateStrBuilder(min_date="1900-01-01", max_date="1950-12-31")
+    years = {date.fromisoformat(v).year for v in builder.build_many(1000)}
+    assert min(years) < 1910 and max(years) > 1940 and years <= set(range(1900, 1951))
+    builder = DateStrBuilder(min_date="3000-01-01", max_date="3000-01-31", day=31)
+    assert builder.build() == "3000-01-31"
+
+
+def test_uuid4_str_builder_buffer():
+    builder = Uuid4StrBuilder(rng=1)
+    first = [builder.build() for _ in range(10)]
+    assert len(builder._buffer) == UUID4_BLOCK_SIZE - 10
+    # Reseeding discards the values buffered from the previous rng
+    builder.seed(1)
+    assert len(builder._buffer) == UUID4_BLOCK_SIZE - 10
+    assert [builder.build() for _ in range(10)] != first[:10]
+    assert len(builder._buffer) == UUID4_BLOCK_SIZE - 10
+    # Pickled builders don't carry the buffer
+    assert pickle.loads(pickle.dumps(builder))._buffer == []
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="Requires fork")
+def test_uuid4_str_builder_buffer_is_emptied_when_forking():
+    builder = Uuid4StrBuilder()
+    builder.build()
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # Child
+        os.write(write, builder.build().encode())
+        os._exit(0)
+    os.waitpid(pid, 0)
+    assert os.read(read, 36).decode() != builder.build()
+
+
+def test_uuid4_strs():
+    values = uuid4_strs(bytes(32))
+    assert values == [str(uuid.UUID(bytes=bytes(16), version=4))] * 2
+    with pytest.raises(AssertionError):
+        uuid4_strs(bytes(15))
@@ -0,0 +1,140 @@
+import random
+import uuid
+
+import pytest
+
+from randinator import engine
+from randinator.builders import (
+    DictBuilder,
+    FingerprintSet,
+    IntegerBuilder,
+    IntegerStrBuilder,
+    PicklistBuilder,
+    TextBuilder,
+    UniqueBuilder,
+    UniqueValuesExhausted,
+    Uuid4StrBuilder,
+    fingerprint,
+)
+from randinator.builders.unique import UNIQUE_STREAMS, _Permutation
+
+
+class CountingTextBuilder(TextBuilder):
+    """Counts the values drawn by all its instances"""
+
+    draws = 0
+
+    def generate_many(self, n: int) -> list[str]:
+        CountingTextBuilder.draws += n
+        return super().generate_many(n)
+
+
+def test_fingerprint_set():
+    fingerprints = [random.getrandbits(64) or 1 for _ in range(10_000)]
+    seen = FingerprintSet()
+    assert all(seen.add(fp) for fp in fingerprints)
+    assert not any(seen.add(fp) for fp in fingerprints)
+    assert len(seen) == 10_000
+    assert all(fp in seen for fp in fingerprints)
+    assert 1 not in seen
+    assert seen.nbytes <= 16 * 2 * 10_000
+
+
+def test_fingerprint_is_stable():
+    assert fingerprint("a") == fingerprint("a") != fingerprint("b")
+    assert fingerprint(1) != fingerprint("1")
+
+
+@pytest.mark.parametrize("cls", [IntegerBuilder, IntegerStrBuilder])
+def test_unique_integers_use_the_whole_range(cls):
+    builder = UniqueBuilder(builder=cls(min_value=10, max_value=1009)).seed(0)
+    values = builder.build_many(600) + [builder.build() for _ in range(400)]
+    assert sorted(map(int, values)) == list(range(10, 1010))
+    assert all(isinstance(v, cls.default_type) for v in values)
+    with pytest.raises(UniqueValuesExhausted, match="no unique values left"):
+        builder.build()
+    # Seeding starts over
+    assert builder.seed(0).build_many(1000) == values
+
+
+@pytest.mark.parametrize("span", [1, 2, 3, 7, 64, 1000, 4097])
+def test_permutation(span):
+    permutation = _Permutation(span, random.Random(span))
+    assert sorted(permutation.items(range(span))) == list(range(span))
+
+
+def test_unique_integers_are_not_a_progression():
+    builder = UniqueBuilder(builder=IntegerBuilder(min_value=0, max_value=999_999))
+    values = builder.seed(1).build_many(1000)
+    steps = {b - a for a, b in zip(values, values[1:])}
+    assert len(steps) > 900
+
+
+def test_unique_compiled_uses_the_whole_range():
+    build = UniqueBuilder(builder=IntegerBuilder(min_value=0, max_value=99)).compile()
+    assert sorted(build() for _ in range(100)) == list(range(100))
+    with pytest.raises(UniqueValuesExhausted):
+        build()
+
+
+def test_unique_text():
+    builder = UniqueBuilder(
+        builder=TextBuilder(min_word_number=1, max_word_number=1, max_length=5)
+    ).seed(1)
+    values = builder.build_many(20_000)
+    assert len(set(values)) == 20_000
+
+
+def test_unique_exhausted():
+    builder = UniqueBuilder(
+        builder=PicklistBuilder(picklist=["a", "b"]), max_retries=50
+    )
+    assert sorted(builder.build_many(2)) == ["a", "b"]
+    with pytest.raises(UniqueValuesExhausted, match="no new value in 50 draws"):
+        builder.build()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_unique_across_shards(workers):
+    builder = DictBuilder(
+        builders={
+            "id": UniqueBuilder(builder=IntegerBuilder(min_value=0, max_value=999)),
+            "ref": UniqueBuilder(
+                builder=IntegerStrBuilder(min_value=0, max_value=10**9)
+            ),
+            "name": UniqueBuilder(builder=PicklistBuilder(picklist=range(1200))),
+        }
+    )
+    records = engine.generate(builder, 1000, seed=3, workers=workers, shard_size=100)
+    for key in ("id", "ref", "name"):
+        assert len({record[key] for record in records}) == 1000
+    assert records == engine.generate(builder, 1000, seed=3, workers=1, shard_size=100)
+    with pytest.raises(UniqueValuesExhausted):
+        engine.generate(builder, 1001, seed=3, workers=1, shard_size=100)
+
+
+def test_unique_uuids():
+    builder = UniqueBuilder(builder=Uuid4StrBuilder()).seed(2)
+    values = builder.build_many(1000) + [builder.build() for _ in range(1000)]
+    assert len(set(values)) == 2000
+    assert all(str(uuid.UUID(value, version=4)) == value for value in values)
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_unique_across_many_shards(workers):
+    text = CountingTextBuilder(min_word_number=1, max_word_number=1, max_length=5)
+    builder = DictBuilder(
+        builders={
+            "id": UniqueBuilder(builder=Uuid4StrBuilder()),
+            "name": UniqueBuilder(builder=text),
+        }
+    )
+    CountingTextBuilder.draws = 0
+    records = engine.generate(builder, 5000, seed=4, workers=1, shard_size=10)
+    # Draws don't grow with the 500 shards
+    assert CountingTextBuilder.draws < 2 * UNIQUE_STREAMS * 5000
+    for key in ("id", "name"):
+        assert len({record[key] for record in records}) == 5000
+    assert records == engine.generate(
+        builder, 5000, seed=4, workers=workers, shard_size=10
+    )
@@ -0,0 +1,30 @@
+import pytest
+
+from randinator.builders import (
+    DecimalBuilder,
+    DictBuilder,
+    IntegerBuilder,
+    ListBuilder,
+    Uuid4StrBuilder,
+)
+
+
+def make_builder() -> DictBuilder:
+    """Returns the record tree shared by the tests, also loaded by reference
+    (`tests.conftest:make_builder`) by the command line tests"""
+    return DictBuilder(
+        builders={
+            "id": Uuid4StrBuilder(),
+            "amount": DecimalBuilder(min_value=0, max_value=10),
+            "values": ListBuilder(
+                min_length=0,
+                max_length=3,
+                builder=IntegerBuilder(min_value=0, max_value=9),
+            ),
+        }
+    )
+
+
+@pytest.fixture
+def builder() -> DictBuilder:
+    return make_builder()
@@ -0,0 +1,87 @@
+import os
+import pickle
+import sys
+
+import pytest
+
+from randinator.data import (
+    Corpus,
+    MmapCorpus,
+    clear_corpus_cache,
+    get_package_filepath,
+    load_corpus,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_corpus_cache()
+    yield
+    clear_corpus_cache()
+
+
+def test_get_package_filepath():
+    assert get_package_filepath("words.txt").is_file()
+    with pytest.raises(AssertionError):
+        get_package_filepath("nonexistent.txt")
+
+
+def test_corpus_from_text():
+    corpus = Corpus.from_text("\nhi\n  \n hello \r\nbye")
+    assert corpus == ("hi", "hello", "bye")
+    assert corpus.nbytes == sys.getsizeof(corpus) + sum(
+        sys.getsizeof(word) for word in ("hi", "hello", "bye")
+    )
+
+
+def test_load_corpus_is_cached(tmp_path):
+    file = tmp_path / "words.txt"
+    file.write_text("hi\nhello\n")
+    corpus = load_corpus(file)
+    assert isinstance(corpus, Corpus)
+    assert load_corpus(str(file)) is corpus
+
+    # A modified file is loaded again
+    file.write_text("bye\n")
+    os.utime(file, ns=(0, 0))
+    assert load_corpus(file) == ("bye",)
+
+
+def test_load_corpus_evicts(tmp_path, monkeypatch):
+    monkeypatch.setattr("randinator.data.corpus.CACHE_MAX_BYTES", 5)
+    first, second = tmp_path / "first.txt", tmp_path / "second.txt"
+    first.write_text("hello\n")
+    second.write_text("world\n")
+    corpus = load_corpus(first)
+    load_corpus(second)
+    assert load_corpus(first) is not corpus
+
+
+def test_mmap_corpus(tmp_path):
+    file = tmp_path / "words.txt"
+    file.write_text("hi\n\nhello\nbye")
+    corpus = load_corpus(file, mmap_threshold=0)
+    assert isinstance(corpus, MmapCorpus)
+    assert len(corpus) == 3
+    assert list(corpus) == ["hi", "hello", "bye"]
+    assert corpus[1] == "hello"
+    assert corpus[-1] == "bye"
+    assert corpus[:2] == ["hi", "hello"]
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_mmap_corpus_skips_blank_lines(tmp_path, monkeypatch, numpy):
+    if not numpy:
+        monkeypatch.setitem(sys.modules, "numpy", None)
+    file = tmp_path / "words.txt"
+    file.write_text("  \na\n  \nb\r\n\n\t\r\nc\n \x0c")
+    corpus = load_corpus(file, mmap_threshold=0)
+    assert list(corpus) == ["a", "b", "c"] == list(Corpus.from_text(file.read_text()))
+
+
+def test_corpus_pickles_through_cache(tmp_path):
+    file = tmp_path / "words.txt"
+    file.write_text("hi\nhello\n")
+    corpus = load_corpus(file)
+    assert pickle.loads(pickle.dumps(corpus)) is corpus
+    assert pickle.loads(pickle.dumps(Corpus(("a",)))) == ("a",)
@@ -0,0 +1,96 @@
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+
+import pytest
+
+from randinator import engine
+from randinator.aio import AsyncRecordSource
+from randinator.builders import (
+    Builder,
+    IntegerBuilder,
+    UniqueBuilder,
+)
+
+
+async def collect(source: AsyncRecordSource) -> list:
+    async with source:
+        return [record async for record in source]
+
+
+def test_async_record_source(builder):
+    records = asyncio.run(
+        collect(AsyncRecordSource(builder, n=50, chunk_size=8, seed=1))
+    )
+    assert records == engine.generate(builder, 50, seed=1, workers=1, shard_size=8)
+    assert builder.rng is None
+
+
+def test_async_record_source_processes(builder):
+    source = AsyncRecordSource(builder, n=50, chunk_size=8, seed=1, processes=2)
+    records = asyncio.run(collect(source))
+    assert records == engine.generate(builder, 50, seed=1, workers=1, shard_size=8)
+
+
+def test_async_record_source_all_processes(builder):
+    async def pool_size() -> int:
+        async with AsyncRecordSource(builder, n=8, processes=0) as source:
+            assert isinstance(source._executor, engine.ShardPool)
+            return source._executor.workers
+
+    assert asyncio.run(pool_size()) == (os.cpu_count() or 1)
+
+
+def test_async_record_source_unique():
+    builder = UniqueBuilder(builder=IntegerBuilder(min_value=0, max_value=47))
+    source = AsyncRecordSource(builder, n=48, chunk_size=8, seed=1)
+    records = asyncio.run(collect(source))
+    assert sorted(records) == list(range(48))
+    assert records == engine.generate(builder, 48, seed=1, workers=1, shard_size=8)
+
+
+def test_async_record_source_endless(builder):
+    async def take(n: int) -> list:
+        async with AsyncRecordSource(builder, chunk_size=4, prefetch=2) as source:
+            return [await source.__anext__() for _ in range(n)]
+
+    assert len(asyncio.run(take(30))) == 30
+
+
+def test_async_record_source_rate(builder):
+    start = time.monotonic()
+    records = asyncio.run(collect(AsyncRecordSource(builder, n=11, rate=100)))
+    assert len(records) == 11
+    assert time.monotonic() - start >= 0.1
+
+
+@dataclass(kw_only=True)
+class FailingBuilder(Builder):
+    default: int | None = None
+    default_type: type = int
+
+    def generate(self) -> int:
+        raise RuntimeError("failed")
+
+    def sanitize(self, value: int) -> int:
+        return value
+
+
+def test_async_record_source_error():
+    with pytest.raises(RuntimeError, match="failed"):
+        asyncio.run(collect(AsyncRecordSource(FailingBuilder(), n=3)))
+
+
+def test_async_record_source_error_is_raised_again():
+    async def next_twice() -> list[str]:
+        errors = []
+        async with AsyncRecordSource(FailingBuilder(), n=3) as source:
+            for _ in range(2):
+                try:
+                    await asyncio.wait_for(source.__anext__(), timeout=5)
+                except RuntimeError as e:
+                    errors.append(str(e))
+        return errors
+
+    assert asyncio.run(next_twice()) == ["failed", "failed"]
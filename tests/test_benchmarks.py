@@ -0,0 +1,44 @@
+import json
+
+from benchmarks import suite
+
+
+def test_every_builtin_builder_is_benchmarked():
+    cases = suite.cases()
+    assert "integer" in cases and "tree:customer" in cases
+    for make_builder in cases.values():
+        make_builder().build_many(2)
+
+
+def test_compare():
+    results = {
+        "a/batch": suite.Result(
+            values_per_second=70.0, allocated_bytes_per_value=0, peak_rss_kb=0
+        ),
+        "b/batch": suite.Result(
+            values_per_second=90.0, allocated_bytes_per_value=0, peak_rss_kb=0
+        ),
+        "c/batch": suite.Result(
+            values_per_second=1.0, allocated_bytes_per_value=0, peak_rss_kb=0
+        ),
+    }
+    baseline = {
+        "a/batch": {"values_per_second": 100.0},
+        "b/batch": {"values_per_second": 100.0},
+    }
+    (regression,) = suite.compare(results, baseline, threshold=0.2)
+    assert regression.startswith("a/batch: 70 values/s, 30% slower than 100")
+
+
+def test_main_saves_and_compares_baselines(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    args = ["-k", "boolean/", "--min-time", "0.001", "--repeat", "1"]
+    assert suite.main([*args, "--save", str(baseline)]) == 0
+    results = json.loads(baseline.read_text())["results"]
+    assert set(results) == {"boolean/single", "boolean/batch"}
+    assert suite.main([*args, "--compare", str(baseline), "--threshold", "100"]) == 0
+    for result in results.values():
+        result["values_per_second"] *= 1000
+    baseline.write_text(json.dumps({"results": results}))
+    assert suite.main([*args, "--compare", str(baseline)]) == 1
+    assert "REGRESSION boolean/single" in capsys.readouterr().out
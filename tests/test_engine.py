@@ -0,0 +1,62 @@
+import copy
+import json
+import pickle
+
+from randinator import engine
+from randinator.builders import FileTextBuilder
+
+
+def test_shard_sizes():
+    assert engine.shard_sizes(25, 10) == [10, 10, 5]
+    assert engine.shard_sizes(20, 10) == [10, 10]
+    assert engine.shard_sizes(0, 10) == []
+
+
+def test_generate_is_independent_of_workers(builder):
+    single = engine.generate(builder, 50, seed=7, workers=1, shard_size=8)
+    multi = engine.generate(builder, 50, seed=7, workers=2, shard_size=8)
+    assert len(single) == 50
+    assert single == multi
+    assert single != engine.generate(builder, 50, seed=8, workers=1, shard_size=8)
+
+
+def test_generate_does_not_seed_builder(builder):
+    engine.generate(builder, 5, seed=1, workers=1)
+    assert builder.rng is None
+
+
+def test_build_shard(builder):
+    (seed,) = engine.shard_seeds(7, 1)
+    engine.init_worker(copy.deepcopy(builder))
+    try:
+        shard = engine.build_shard(seed, 8, (0, 1, 7))
+    finally:
+        engine.init_worker(None)
+    assert shard == engine.generate(builder, 8, seed=7, workers=1, shard_size=8)
+    assert engine.build_chunk(copy.deepcopy(builder), seed, 8, (0, 1, 7)) == shard
+
+
+def test_write_shards(builder, tmp_path):
+    filepaths = engine.write_shards(
+        builder, 25, tmp_path, seed=3, workers=2, shard_size=10
+    )
+    assert [f.name for f in filepaths] == [
+        "shard-00000.jsonl",
+        "shard-00001.jsonl",
+        "shard-00002.jsonl",
+    ]
+    records = [
+        json.loads(line) for f in filepaths for line in f.read_text().splitlines()
+    ]
+    expected = engine.generate(builder, 25, seed=3, workers=1, shard_size=10)
+    assert records == [{**r, "amount": str(r["amount"])} for r in expected]
+
+
+def test_file_text_builder_pickles_open_file(tmp_path):
+    file = tmp_path / "test.txt"
+    file.write_text("hi\nhello\n")
+    with open(file) as f:
+        builder = FileTextBuilder(filepath=f, min_word_number=1, max_word_number=2)
+    restored = pickle.loads(pickle.dumps(builder))
+    assert restored.filepath == str(file)
+    assert all(w in ("hi", "hello") for w in restored.build().split())
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from randinator import PydanticModel
+from randinator.structure.customer import Customer
+
+
+class Item(PydanticModel):
+    name: str
+    tags: list[str] = []
+
+
+class Order(PydanticModel):
+    uuid: str
+    item: Item
+    items: list[Item]
+    gift: Item | None = None
+
+
+DATA = {
+    "uuid": "a",
+    "item": {"name": "x", "tags": ["t"]},
+    "items": [{"name": "y"}, {"name": "z", "tags": []}],
+}
+
+
+def test_as_dict_does_not_share_containers():
+    order = Order.from_dict(DATA)
+    data = order.as_dict()
+    data["item"]["tags"].append("u")
+    assert order.item.tags == ["t"]
+    assert order.as_json() == {**DATA, "items": order.as_dict()["items"], "gift": None}
+
+
+def test_from_dict_does_not_share_containers():
+    data = json.loads(json.dumps(DATA))
+    order = Order.from_dict(data)
+    data["item"]["tags"].append("u")
+    assert order.item.tags == ["t"]
+
+
+def test_as_bytes():
+    order = Order.from_dict(DATA)
+    assert order.as_bytes() == order.as_str().encode()
+
+
+def test_validate_many():
+    orders = Order.validate_many([DATA, DATA])
+    assert orders == [Order.from_dict(DATA)] * 2
+    assert Order.validate_many(iter([DATA])) == [Order.from_dict(DATA)]
+    with pytest.raises(ValidationError):
+        Order.validate_many([{"uuid": "a"}])
+
+
+def test_construct_many():
+    (order,) = Order.construct_many([DATA])
+    assert isinstance(order.item, Item)
+    assert all(isinstance(item, Item) for item in order.items)
+    assert order.gift is None
+    assert order.items[0].tags == []
+    assert order == Order.from_dict(DATA)
+    assert order.as_bytes() == Order.from_dict(DATA).as_bytes()
+
+    (order,) = Order.construct_many([{**DATA, "gift": {"name": "g", "tags": []}}])
+    assert order.gift == Item(name="g")
+    assert order.model_fields_set == {"uuid", "item", "items", "gift"}
+
+
+def test_customer_schema():
+    assert "contacts" in Customer.model_fields
@@ -0,0 +1,136 @@
+import json
+import pickle
+
+import pytest
+
+from randinator import schema
+from randinator.builders import DictBuilder, ListBuilder, PicklistBuilder
+from randinator.main_pckg import main
+
+YAML_SCHEMA = """
+type: dict
+builders:
+  id:
+    type: uuid4_str
+  status:
+    type: picklist
+    picklist: [open, paid]
+  lines:
+    type: list
+    min_length: 1
+    max_length: 3
+    builder:
+      type: dict
+      builders:
+        quantity: {type: integer, min_value: 1, max_value: 5}
+        note: {type: nullable, builder: {type: text, min_word_number: 1,
+               max_word_number: 2}}
+"""
+
+
+def test_build_schema():
+    builder = schema.parse_schema(YAML_SCHEMA, ".yaml")
+    builder = schema.build_schema(builder)
+    assert isinstance(builder, DictBuilder)
+    assert isinstance(builder.builders["status"], PicklistBuilder)
+    assert isinstance(builder.builders["lines"], ListBuilder)
+    for record in builder.build_many(50):
+        assert record["status"] in ("open", "paid")
+        assert 1 <= len(record["lines"]) <= 3
+        assert all(1 <= line["quantity"] <= 5 for line in record["lines"])
+
+
+def test_build_schema_field_named_type():
+    builder = schema.build_schema(
+        {
+            "type": "dict",
+            "builders": {
+                "type": {"type": "picklist", "picklist": ["a", "b"]},
+                "uuid": {"type": "uuid4_str"},
+            },
+        }
+    )
+    assert isinstance(builder, DictBuilder)
+    assert builder.builders.keys() == {"type", "uuid"}
+    assert builder.build()["type"] in ("a", "b")
+
+
+@pytest.mark.parametrize(
+    "node, match",
+    [
+        ({"type": "no_such"}, r"schema: No builder named 'no_such'"),
+        ({"type": "integer", "min_value": 1}, r"schema: invalid 'integer' builder"),
+        (
+            {
+                "type": "dict",
+                "builders": {"a": {"type": "integer", "min_value": 2, "max_value": 1}},
+            },
+            r"schema.builders.a: invalid 'integer'",
+        ),
+        ({"builders": {}}, "must be a node"),
+        ({"type": {"type": "integer"}}, r"schema.type: \{'type': 'integer'\} is not"),
+    ],
+)
+def test_build_schema_errors(node, match):
+    with pytest.raises(schema.SchemaError, match=match):
+        schema.build_schema(node)
+
+
+def test_load_schema_is_cached(tmp_path, monkeypatch):
+    filepath = tmp_path / "invoice.yaml"
+    filepath.write_text(YAML_SCHEMA)
+    cache_dir = tmp_path / "cache"
+    builder = schema.load_schema(filepath, cache_dir=cache_dir)
+    (cache_path,) = cache_dir.iterdir()
+    assert pickle.loads(cache_path.read_bytes()) == builder
+
+    def fail(*args):
+        raise AssertionError("cached schemas must not be parsed")
+
+    monkeypatch.setattr(schema, "parse_schema", fail)
+    assert schema.load_schema(filepath, cache_dir=cache_dir) == builder
+    # A corrupt cache is rebuilt
+    cache_path.write_bytes(b"corrupt")
+    monkeypatch.undo()
+    assert schema.load_schema(filepath, cache_dir=cache_dir) == builder
+    assert pickle.loads(cache_path.read_bytes()) == builder
+
+
+def test_load_schema_cache_key_is_the_content(tmp_path):
+    filepath = tmp_path / "schema.json"
+    filepath.write_text(json.dumps({"type": "integer", "min_value": 1, "max_value": 1}))
+    assert schema.load_schema(filepath, cache_dir=tmp_path / "cache").build() == 1
+    filepath.write_text(json.dumps({"type": "integer", "min_value": 2, "max_value": 2}))
+    assert schema.load_schema(filepath, cache_dir=tmp_path / "cache").build() == 2
+    assert len(list((tmp_path / "cache").iterdir())) == 2
+
+
+def test_load_schema_cache_key_is_the_sources(tmp_path, monkeypatch):
+    assert len(schema._sources_digest()) == 64
+    filepath = tmp_path / "schema.json"
+    filepath.write_text(json.dumps({"type": "integer", "min_value": 1, "max_value": 1}))
+    schema.load_schema(filepath, cache_dir=tmp_path / "cache")
+    monkeypatch.setattr(schema, "_sources_digest", lambda: "0" * 64)
+    schema.load_schema(filepath, cache_dir=tmp_path / "cache")
+    assert len(list((tmp_path / "cache").iterdir())) == 2
+
+
+def test_load_schema_unpicklable_tree_is_not_cached(tmp_path, monkeypatch):
+    def dump(*args, **kwargs):
+        raise AttributeError("Can't pickle local object")
+
+    filepath = tmp_path / "schema.json"
+    filepath.write_text(json.dumps({"type": "integer", "min_value": 1, "max_value": 1}))
+    monkeypatch.setattr(schema.pickle, "dump", dump)
+    assert schema.load_schema(filepath, cache_dir=tmp_path / "cache").build() == 1
+    assert list((tmp_path / "cache").iterdir()) == []
+
+
+def test_main_with_schema(tmp_path, monkeypatch):
+    monkeypatch.setenv("RANDINATOR_CACHE_DIR", str(tmp_path / "cache"))
+    filepath = tmp_path / "schema.yaml"
+    filepath.write_text(YAML_SCHEMA)
+    output = tmp_path / "out.jsonl"
+    main([str(filepath), "-n", "20", "-o", str(output)])
+    assert len(output.read_text().splitlines()) == 20
+    assert (tmp_path / "cache" / "schemas").is_dir()
@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+import sys
+
+import pytest
+
+from randinator import engine, sinks
+from randinator.builders import (
+    DictBuilder,
+    IntegerBuilder,
+)
+from randinator.main_pckg import main
+
+
+def records_of(builder: DictBuilder, n: int, chunk_size: int, seed: int) -> list:
+    return engine.generate(builder, n, seed=seed, workers=1, shard_size=chunk_size)
+
+
+def test_write_jsonl(builder, tmp_path):
+    file = tmp_path / "out.jsonl"
+    sinks.write(builder, 25, file, chunk_size=10, seed=1)
+    lines = file.read_text().splitlines()
+    assert len(lines) == 25
+    expected = records_of(builder, 25, 10, 1)
+    for line, record in zip(lines, expected):
+        assert json.loads(line) == {**record, "amount": str(record["amount"])}
+
+
+def test_write_jsonl_text_file(builder):
+    file = io.StringIO()
+    sinks.write(builder, 3, file, format="jsonl")
+    assert len(file.getvalue().splitlines()) == 3
+
+
+def test_json_lines_sink_without_orjson(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    file = tmp_path / "out.jsonl"
+    with sinks.JsonLinesSink(file) as sink:
+        sink.write_chunk([{"a": 1}, {"a": 2}])
+    assert file.read_text() == '{"a": 1}\n{"a": 2}\n'
+
+
+def test_write_csv(builder, tmp_path):
+    file = tmp_path / "out.csv"
+    sinks.write(builder, 15, file, chunk_size=4, seed=2)
+    with open(file, newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["id", "amount", "values"]
+    assert len(rows) == 16
+    expected = records_of(builder, 15, 4, 2)
+    assert [json.loads(row[2]) for row in rows[1:]] == [r["values"] for r in expected]
+
+
+def test_sink_is_abstract(tmp_path):
+    with pytest.raises(TypeError, match="abstract"):
+        sinks.Sink(tmp_path / "out")
+
+
+def test_get_sink(tmp_path):
+    for name in ("out.txt", "out.json"):
+        with pytest.raises(AssertionError, match="Can't infer the format"):
+            sinks.get_sink(tmp_path / name)
+    with pytest.raises(AssertionError):
+        sinks.get_sink(
+            tmp_path / "out.csv", builder=IntegerBuilder(min_value=0, max_value=1)
+        )
+    with pytest.raises(ValueError):
+        sinks.get_sink(tmp_path / "out", format="xml")
+
+
+def test_write_parquet(builder, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    file = tmp_path / "out.parquet"
+    sinks.write(builder, 25, file, chunk_size=10)
+    assert pq.read_table(file).num_rows == 25
+
+
+def test_main(tmp_path):
+    file = tmp_path / "out.jsonl"
+    main(["tests.conftest:make_builder", "-n", "12", "-o", str(file), "--seed", "3"])
+    assert len(file.read_text().splitlines()) == 12